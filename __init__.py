@@ -2,6 +2,12 @@
 
 from __future__ import annotations
 
+from collections import Counter
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+import os
+
 from aiohttp import web
 
 from homeassistant.core import HomeAssistant
@@ -11,8 +17,49 @@ from homeassistant.components.webhook import (
     async_unregister,
 )
 
-from .coordinator import APTiDataUpdateCoordinator
-from .const import DOMAIN, LOGGER, PLATFORMS, CONF_WEBHOOK_ID
+from .api import APTiVersionMismatch
+from .coordinator import APTiDataUpdateCoordinator, APTiQueueFull, snapshot_store
+from .history import history_path
+from .const import (
+    DOMAIN,
+    LOGGER,
+    PLATFORMS,
+    CONF_WEBHOOK_ID,
+    DATA_ROUTES,
+    MAX_WEBHOOK_PAYLOAD,
+)
+from .helper import (
+    InvalidPayload,
+    InvalidSignature,
+    NonceCache,
+    PayloadTooLarge,
+    UnsupportedEncoding,
+    check_signature_headers,
+    read_webhook_json,
+    verify_signature,
+    webhook_secret,
+)
+
+
+@dataclass
+class WebhookRoute:
+    """Webhook ID로 찾는 엔트리 경로."""
+
+    coordinator: APTiDataUpdateCoordinator
+    # 공유 비밀키 (없으면 서명 확인 안 함)
+    secret: str | None = None
+    # 서명이 확인된 nonce
+    nonces: NonceCache = field(default_factory=NonceCache)
+    # 본문을 기다리는 중인 요청의 nonce
+    pending_nonces: set[str] = field(default_factory=set)
+    # 요청 수 및 응답 코드별 횟수 (진단용)
+    requests: int = 0
+    responses: Counter[int] = field(default_factory=Counter)
+
+
+def _routes(hass: HomeAssistant) -> dict[str, WebhookRoute]:
+    """Webhook ID → 경로 테이블."""
+    return hass.data.setdefault(DOMAIN, {}).setdefault(DATA_ROUTES, {})
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -21,8 +68,18 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     entry.runtime_data = coordinator
 
+    # 재시작 직후에도 마지막 수신 데이터로 센서 표시
+    await coordinator.async_restore_snapshot()
+
+    # 수신한 Webhook 데이터는 응답 후 순서대로 처리
+    entry.async_create_background_task(
+        hass, coordinator.async_process_webhooks(), f"{DOMAIN} webhook {entry.entry_id}"
+    )
+
     # Webhook 등록
     webhook_id = entry.data[CONF_WEBHOOK_ID]
+    _routes(hass)[webhook_id] = WebhookRoute(coordinator, secret=webhook_secret(entry))
+    entry.async_on_unload(entry.add_update_listener(_async_update_options))
     async_register(
         hass,
         DOMAIN,
@@ -37,23 +94,94 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return True
 
 
+async def _async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """옵션에서 바꾼 Webhook 비밀키 반영 (엔트리를 다시 불러오지 않음)."""
+    route = _routes(hass).get(entry.data[CONF_WEBHOOK_ID])
+    if route is not None:
+        route.secret = webhook_secret(entry)
+        LOGGER.info("Webhook 서명 확인: %s", "사용" if route.secret else "사용 안 함")
+
+
 async def handle_webhook(
     hass: HomeAssistant, webhook_id: str, request: web.Request
 ) -> web.Response:
     """Handle incoming webhook from GitHub Actions."""
+    # 본문을 읽기 전에 webhook_id로 해당 entry 찾기
+    route = _routes(hass).get(webhook_id)
+    if route is None:
+        LOGGER.warning("일치하는 entry를 찾을 수 없음: %s", webhook_id)
+        return web.Response(text="Entry not found", status=404)
+
+    route.requests += 1
+    response = await _async_handle_route(route, webhook_id, request)
+    route.responses[response.status] += 1
+    return response
+
+
+@contextmanager
+def _signature_verifier(
+    route: WebhookRoute, request: web.Request
+) -> Iterator[Callable[[bytes], None]]:
+    """서명 헤더를 확인하고 본문 서명 확인 함수 제공.
+
+    nonce는 서명이 맞을 때만 기록해 서명 없는 요청이 기록을 밀어내지 못하게 하고,
+    본문을 기다리는 동안 같은 nonce의 요청이 동시에 들어오면 거부합니다.
+    """
+    timestamp, nonce, signature = check_signature_headers(
+        request.headers, route.nonces
+    )
+    if nonce in route.pending_nonces:
+        raise InvalidSignature(f"처리 중인 요청과 같은 nonce: {nonce}")
+
+    def verify(body: bytes) -> None:
+        verify_signature(route.secret, timestamp, nonce, signature, body)
+        route.nonces.add(nonce)
+
+    route.pending_nonces.add(nonce)
     try:
-        payload = await request.json()
+        yield verify
+    finally:
+        route.pending_nonces.discard(nonce)
+
+
+async def _async_handle_route(
+    route: WebhookRoute, webhook_id: str, request: web.Request
+) -> web.Response:
+    """엔트리 하나에 대한 Webhook 요청 처리."""
+    try:
+        # 헤더만으로 거부할 수 있는 요청은 본문을 읽지 않음
+        verifier = _signature_verifier(route, request) if route.secret else nullcontext()
+        with verifier as verify:
+            payload = await read_webhook_json(request, MAX_WEBHOOK_PAYLOAD, verify)
         LOGGER.info("Webhook 수신: %s", webhook_id)
 
-        # webhook_id로 해당 entry 찾기
-        for entry in hass.config_entries.async_entries(DOMAIN):
-            if entry.data.get(CONF_WEBHOOK_ID) == webhook_id:
-                coordinator: APTiDataUpdateCoordinator = entry.runtime_data
-                coordinator.handle_webhook(payload)
-                return web.Response(text="OK", status=200)
+        route.coordinator.async_enqueue_webhook(payload)
+        return web.Response(text="Accepted", status=202)
 
-        LOGGER.warning("일치하는 entry를 찾을 수 없음: %s", webhook_id)
-        return web.Response(text="Entry not found", status=404)
+    except InvalidSignature as err:
+        LOGGER.warning("Webhook 서명 확인 실패: %s", err)
+        return web.Response(text="Invalid signature", status=401)
+
+    except PayloadTooLarge as err:
+        LOGGER.warning("Webhook 본문 거부: %s", err)
+        return web.Response(text=str(err), status=413)
+
+    except UnsupportedEncoding as err:
+        LOGGER.warning("Webhook 본문 거부: %s", err)
+        return web.Response(text=str(err), status=415)
+
+    except InvalidPayload as err:
+        LOGGER.warning("Webhook 본문 해석 실패: %s", err)
+        return web.Response(text="Invalid payload", status=400)
+
+    except APTiQueueFull as err:
+        LOGGER.warning("Webhook 처리 지연, 수신 거부: %s", err)
+        return web.Response(text=str(err), status=429)
+
+    except APTiVersionMismatch as err:
+        # 파서가 전체 데이터를 다시 보내도록 요청
+        LOGGER.info("부분 데이터 거부: %s", err)
+        return web.Response(text=str(err), status=409)
 
     except Exception as err:
         LOGGER.error("Webhook 처리 오류: %s", err)
@@ -65,8 +193,20 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Webhook 해제
     webhook_id = entry.data[CONF_WEBHOOK_ID]
     async_unregister(hass, webhook_id)
+    _routes(hass).pop(webhook_id, None)
     LOGGER.info("Webhook 해제: %s", webhook_id)
 
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    if unload_ok:
+        await hass.async_add_executor_job(entry.runtime_data.history.close)
 
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the APT.i config entry."""
+    # 저장된 스냅샷과 월별 이력 삭제
+    await snapshot_store(hass, entry.entry_id).async_remove()
+    path = history_path(hass, entry.entry_id)
+    if await hass.async_add_executor_job(os.path.exists, path):
+        await hass.async_add_executor_job(os.remove, path)
@@ -2,9 +2,77 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import date, datetime
+from itertools import chain
+import time
+from typing import Any
 
-from .const import LOGGER
+from . import schema
+from .const import LOGGER, PAYLOAD_SECTIONS
+from .helper import parse_amount
+
+
+class APTiVersionMismatch(Exception):
+    """부분 페이로드의 기준 버전이 현재 데이터와 다름."""
+
+
+# 관리비 총액 센서에 표시할 상위 항목 수
+TOP_ITEM_COUNT = 3
+
+
+@dataclass(slots=True)
+class MaintItem:
+    """관리비 항목."""
+
+    name: str
+    current: int | None = None
+    previous: int | None = None
+    change: int | None = None
+
+
+@dataclass(slots=True)
+class PaymentStatus:
+    """이번 달 관리비 납부 정보."""
+
+    amount: int | None = None
+    charged: int | None = None
+    month: str | None = None
+    deadline: str | None = None
+    status: str | None = None
+
+
+@dataclass(slots=True)
+class EnergyCategory:
+    """에너지 카테고리별 사용량/요금."""
+
+    type: str
+    usage: str | None = None
+    cost: int | None = None
+    comparison: str | None = None
+
+
+@dataclass(slots=True)
+class EnergyBill:
+    """에너지 종류별 상세 요금."""
+
+    type: str
+    total: int | None = None
+    comparison: str | None = None
+    details: dict[str, int | str] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class Payment:
+    """납부내역 한 건."""
+
+    date: str
+    paid_on: date | None = None
+    amount: int | None = None
+    billing_month: str | None = None
+    deadline: str | None = None
+    bank: str | None = None
+    method: str | None = None
+    status: str | None = None
 
 
 @dataclass
@@ -16,18 +84,308 @@ class APTiData:
     apt_name: str = ""
 
     # 관리비 정보
-    maint_items: list[dict] = field(default_factory=list)
-    maint_payment: dict = field(default_factory=dict)
+    maint_items: list[MaintItem] = field(default_factory=list)
+    maint_payment: PaymentStatus = field(default_factory=PaymentStatus)
 
     # 에너지 정보
-    energy_category: list[dict] = field(default_factory=list)
-    energy_type: list[dict] = field(default_factory=list)
+    energy_category: list[EnergyCategory] = field(default_factory=list)
+    energy_type: list[EnergyBill] = field(default_factory=list)
 
     # 납부 내역
-    payment_history: list[dict] = field(default_factory=list)
+    payment_history: list[Payment] = field(default_factory=list)
 
     # 상태
     last_update: str = ""
+    version: str = ""
+    # 코디네이터가 갱신할 때마다 1씩 증가 (센서 캐시 키)
+    revision: int = 0
+
+    # 센서 조회용 인덱스 (항목명/에너지 종류 → 레코드)
+    maint_index: dict[str, MaintItem] = field(default_factory=dict, repr=False)
+    energy_category_index: dict[str, EnergyCategory] = field(
+        default_factory=dict, repr=False
+    )
+    energy_type_index: dict[str, EnergyBill] = field(default_factory=dict, repr=False)
+
+    # 금액 기준 상위 관리비 항목
+    top_maint_items: list[MaintItem] = field(default_factory=list, repr=False)
+
+    def rebuild_indexes(self) -> None:
+        """목록 데이터로 인덱스 재생성 (같은 키는 처음 나온 레코드 사용)."""
+        self.maint_index = {}
+        for item in self.maint_items:
+            self.maint_index.setdefault(item.name, item)
+        self.energy_category_index = {}
+        for energy in self.energy_category:
+            self.energy_category_index.setdefault(energy.type, energy)
+        self.energy_type_index = {}
+        for bill in self.energy_type:
+            self.energy_type_index.setdefault(bill.type, bill)
+
+        self.top_maint_items = sorted(
+            self.maint_items, key=lambda item: item.current or 0, reverse=True
+        )[:TOP_ITEM_COUNT]
+
+
+def _amount(value) -> int | None:
+    """금액 문자열을 정수로 변환 (빈 값은 None)."""
+    if value in (None, ""):
+        return None
+    return parse_amount(value)
+
+
+def _paid_on(value: str) -> date | None:
+    """납부일 문자열(YYYY.MM.DD) 파싱."""
+    try:
+        return datetime.strptime(value.strip()[:10], "%Y.%m.%d").date()
+    except ValueError:
+        return None
+
+
+def parse_maint_items(raw: list[dict]) -> list[MaintItem]:
+    """관리비 항목 페이로드 변환."""
+    return [
+        MaintItem(
+            name=item.get("item", ""),
+            current=_amount(item.get("current")),
+            previous=_amount(item.get("previous")),
+            change=_amount(item.get("change")),
+        )
+        for item in raw
+    ]
+
+
+def parse_maint_payment(raw: dict) -> PaymentStatus:
+    """관리비 납부액 페이로드 변환."""
+    return PaymentStatus(
+        amount=_amount(raw.get("amount")),
+        charged=_amount(raw.get("charged")),
+        month=raw.get("month"),
+        deadline=raw.get("deadline"),
+        status=raw.get("status"),
+    )
+
+
+def parse_energy_category(raw: list[dict]) -> list[EnergyCategory]:
+    """에너지 카테고리 페이로드 변환."""
+    return [
+        EnergyCategory(
+            type=energy.get("type", ""),
+            usage=energy.get("usage"),
+            cost=_amount(energy.get("cost")),
+            comparison=energy.get("comparison"),
+        )
+        for energy in raw
+    ]
+
+
+def parse_energy_type(raw: list[dict]) -> list[EnergyBill]:
+    """에너지 종류별 페이로드 변환 (상세 항목은 가능하면 정수로)."""
+    bills = []
+    for energy in raw:
+        details: dict[str, int | str] = {}
+        for key, value in energy.items():
+            if key in ("type", "total", "comparison"):
+                continue
+            try:
+                details[key] = int(value)
+            except (ValueError, TypeError):
+                details[key] = value
+        bills.append(
+            EnergyBill(
+                type=energy.get("type", ""),
+                total=_amount(energy.get("total")),
+                comparison=energy.get("comparison"),
+                details=details,
+            )
+        )
+    return bills
+
+
+def parse_payment_history(raw: list[dict]) -> list[Payment]:
+    """납부내역 페이로드 변환."""
+    return [
+        Payment(
+            date=payment.get("date", ""),
+            paid_on=_paid_on(payment.get("date", "")),
+            amount=_amount(payment.get("amount")),
+            billing_month=payment.get("billing_month"),
+            deadline=payment.get("deadline"),
+            bank=payment.get("bank"),
+            method=payment.get("method"),
+            status=payment.get("status"),
+        )
+        for payment in raw
+    ]
+
+
+# 항목 단위로 변경을 추적하는 섹션 → 레코드 키 필드
+KEYED_SECTIONS = {
+    "maint_items": "name",
+    "energy_category": "type",
+    "energy_type": "type",
+}
+
+
+# 데이터가 바뀔 때마다 항상 호출되는 알림 키
+UPDATE_KEY_ANY = "*"
+
+
+def update_key(section: str, name: str | None = None) -> str:
+    """변경 알림 키 (섹션 전체 또는 섹션 내 항목)."""
+    return section if name is None else f"{section}:{name}"
+
+
+def _changed_keys(section: str, old: Any, new: Any) -> set[str]:
+    """섹션 변경으로 영향받는 알림 키."""
+    keys = {update_key(section)}
+    field_name = KEYED_SECTIONS.get(section)
+    if field_name is None:
+        return keys
+
+    old_by_key = {getattr(record, field_name): record for record in old}
+    new_by_key = {getattr(record, field_name): record for record in new}
+    for name in old_by_key.keys() | new_by_key.keys():
+        if old_by_key.get(name) != new_by_key.get(name):
+            keys.add(update_key(section, name))
+    return keys
+
+
+# 섹션별 (빈 값, 변환 함수)
+SECTION_PARSERS = {
+    "maint_items": ([], parse_maint_items),
+    "maint_payment": ({}, parse_maint_payment),
+    "energy_category": ([], parse_energy_category),
+    "energy_type": ([], parse_energy_type),
+    "payment_history": ([], parse_payment_history),
+}
+
+
+# 새 레코드만 받아 기존 레코드 앞에 붙이는 섹션 → 레코드 키 필드
+APPEND_SECTIONS = {
+    "payment_history": ("date", "billing_month"),
+}
+
+
+def _append_list(payload: dict) -> list | None:
+    """페이로드의 append 섹션 목록 (형식이 잘못되면 None)."""
+    append = payload.get("append", [])
+    if not isinstance(append, list) or not all(isinstance(section, str) for section in append):
+        return None
+    return [section for section in append if section in APPEND_SECTIONS]
+
+
+@dataclass(slots=True)
+class ValidatedPayload:
+    """검증과 변환을 마친 Webhook 페이로드."""
+
+    delta: bool
+    base_version: str | None
+    version: str
+    timestamp: str
+    # None이면 격리 (기존 값 유지)
+    dong_ho: str | None
+    # 섹션 → (정규화한 원본, 변환한 레코드)
+    sections: dict[str, tuple[Any, Any]] = field(default_factory=dict)
+    # 기존 레코드에 이어 붙일 섹션
+    append: set[str] = field(default_factory=set)
+    # 격리한 섹션 → 사유
+    quarantined: dict[str, str] = field(default_factory=dict)
+    # 섹션별 검증/변환 시간 (ms)
+    timings: dict[str, float] = field(default_factory=dict)
+
+
+def validate_payload(payload: dict) -> ValidatedPayload:
+    """Webhook 페이로드 검증, 정규화 및 레코드 변환.
+
+    이벤트 루프를 쓰지 않으므로 executor에서 실행할 수 있습니다.
+    잘못된 섹션은 적용하지 않고 quarantined에 사유를 남깁니다.
+    """
+    is_delta = bool(payload.get("delta"))
+    quarantined: dict[str, str] = {}
+
+    try:
+        dong_ho = schema.dong_ho(payload.get("dong_ho"))
+    except schema.SchemaError as err:
+        dong_ho = None
+        quarantined["dong_ho"] = str(err)
+
+    try:
+        timestamp = schema.timestamp(payload.get("timestamp"))
+    except schema.SchemaError as err:
+        timestamp = None
+        quarantined["timestamp"] = str(err)
+
+    validated = ValidatedPayload(
+        delta=is_delta,
+        base_version=payload.get("base_version"),
+        version=schema.text(payload.get("version")) or "",
+        timestamp=timestamp or datetime.now().isoformat(),
+        dong_ho=dong_ho,
+        quarantined=quarantined,
+    )
+
+    append = _append_list(payload)
+    if append is None:
+        # 새 레코드만 담긴 섹션을 전체로 대체하지 않도록 격리
+        append = []
+        for section in APPEND_SECTIONS:
+            if section in payload:
+                quarantined[section] = "append가 문자열 목록이 아님"
+    validated.append = set(append)
+
+    for section in PAYLOAD_SECTIONS:
+        if (is_delta and section not in payload) or section in quarantined:
+            continue
+        empty, parse = SECTION_PARSERS[section]
+        start = time.perf_counter()
+        try:
+            value = schema.normalize_section(section, payload.get(section, empty))
+            validated.sections[section] = (value, parse(value))
+        except schema.SchemaError as err:
+            quarantined[section] = str(err)
+        validated.timings[section] = (time.perf_counter() - start) * 1000
+
+    return validated
+
+
+def merge_payloads(queued: dict, newer: dict) -> dict:
+    """대기 중인 페이로드에 이어서 받은 페이로드를 합침.
+
+    전체 페이로드는 그대로 대체하고, 부분 페이로드는 포함된 섹션만 덮어씁니다.
+    합친 결과는 대기 중이던 페이로드의 기준 버전을 유지합니다.
+    append 섹션은 두 페이로드의 레코드를 이어 붙입니다 (새 레코드가 앞).
+    append 형식이 잘못되면 이어 붙이지 않고 검증에서 격리되도록 그대로 남깁니다.
+    """
+    newer_append = _append_list(newer)
+    if newer.get("delta"):
+        merged = dict(queued)
+        for key, value in newer.items():
+            if key not in ("delta", "base_version", "append"):
+                merged[key] = value
+        queued_append = _append_list(queued)
+        if queued_append is None or newer_append is None:
+            # 잘못된 append는 이어 붙이지 않고 그대로 남겨 검증에서 격리
+            merged["append"] = queued["append"] if queued_append is None else newer["append"]
+            return merged
+        # 대기 중이던 섹션은 대기 중이던 방식(대체/이어 붙이기)을 유지
+        append = set(queued_append)
+        append |= {section for section in newer_append if section not in queued}
+    else:
+        merged = dict(newer)
+        if newer_append is None:
+            return merged
+        append = set(newer_append)
+
+    for section in newer_append:
+        if isinstance(queued.get(section), list) and isinstance(newer.get(section), list):
+            merged[section] = newer[section] + queued[section]
+
+    if append:
+        merged["append"] = sorted(append)
+    else:
+        merged.pop("append", None)
+    return merged
 
 
 class APTiAPI:
@@ -41,27 +399,92 @@ class APTiAPI:
         self.webhook_id = webhook_id
         self._logged_in = False
         self.data = APTiData()
+        # 섹션별 마지막 원본 페이로드 (변경 비교용)
+        self._raw: dict[str, Any] = {}
+
+    def update_from_webhook(self, payload: dict) -> set[str]:
+        """Webhook 페이로드로 데이터 업데이트 (검증을 이벤트 루프에서 수행)."""
+        return self.apply_payload(validate_payload(payload))
 
-    def update_from_webhook(self, payload: dict) -> None:
-        """Webhook 페이로드로 데이터 업데이트."""
+    def apply_payload(self, validated: ValidatedPayload) -> set[str]:
+        """검증한 페이로드로 데이터 업데이트.
+
+        부분 페이로드(delta)는 포함된 섹션만 덮어씁니다.
+        바뀐 섹션/항목의 알림 키를 반환합니다 (바뀐 것이 없으면 빈 집합).
+        """
         LOGGER.info("Webhook 데이터 수신")
 
-        self.data.dong_ho = payload.get("dong_ho", "")
-        self.data.maint_items = payload.get("maint_items", [])
-        self.data.maint_payment = payload.get("maint_payment", {})
-        self.data.energy_category = payload.get("energy_category", [])
-        self.data.energy_type = payload.get("energy_type", [])
-        self.data.payment_history = payload.get("payment_history", [])
-        self.data.last_update = payload.get("timestamp", datetime.now().isoformat())
+        if validated.delta and validated.base_version != self.data.version:
+            raise APTiVersionMismatch(
+                f"기준 버전 불일치: {validated.base_version} != {self.data.version}"
+            )
+
+        changed: set[str] = set()
+        if validated.dong_ho is not None and validated.dong_ho != self.data.dong_ho:
+            self.data.dong_ho = validated.dong_ho
+            changed.add(update_key("dong_ho"))
 
+        for section, (value, records) in validated.sections.items():
+            empty, _parse = SECTION_PARSERS[section]
+            if section in validated.append:
+                value, records = self._append_records(section, value, records)
+            if value != self._raw.get(section, empty):
+                changed |= _changed_keys(section, getattr(self.data, section), records)
+                setattr(self.data, section, records)
+                self._raw[section] = value
+
+        self.data.last_update = validated.timestamp
+        # 격리한 섹션이 있으면 버전을 비워 다음 부분 전송 대신 전체 전송을 받음
+        if any(section in validated.quarantined for section in PAYLOAD_SECTIONS):
+            self.data.version = ""
+        else:
+            self.data.version = validated.version
         self._logged_in = True
 
+        if not changed:
+            LOGGER.info("변경된 데이터 없음")
+            return changed
+
+        self.data.rebuild_indexes()
+
         LOGGER.info(
             "데이터 업데이트 완료 - 동호: %s, 관리비: %d항목, 에너지: %d항목",
             self.data.dong_ho,
             len(self.data.maint_items),
             len(self.data.energy_category),
         )
+        return changed
+
+    def _append_records(
+        self, section: str, value: list, records: list
+    ) -> tuple[list, list]:
+        """새 레코드를 기존 레코드 앞에 붙임 (같은 키는 새 레코드 사용)."""
+        fields = APPEND_SECTIONS[section]
+        seen = set()
+        merged_value = []
+        merged_records = []
+        for raw, record in chain(
+            zip(value, records),
+            zip(self._raw.get(section, []), getattr(self.data, section)),
+        ):
+            key = tuple(raw.get(name) for name in fields)
+            if key in seen:
+                continue
+            seen.add(key)
+            merged_value.append(raw)
+            merged_records.append(record)
+        return merged_value, merged_records
+
+    def snapshot(self) -> dict:
+        """현재 데이터를 전체 Webhook 페이로드 형태로 반환 (재시작 시 복원용)."""
+        snapshot = {
+            section: self._raw.get(section, empty)
+            for section, (empty, _parse) in SECTION_PARSERS.items()
+        }
+        snapshot["dong_ho"] = self.data.dong_ho
+        snapshot["timestamp"] = self.data.last_update
+        snapshot["version"] = self.data.version
+        return snapshot
 
     async def login(self) -> bool:
         """로그인 (Webhook 방식에서는 사용하지 않음)."""
@@ -0,0 +1,171 @@
+"""APT.i 파서 오프라인 벤치마크.
+
+APTI_RECORD_DIR로 저장한 페이지를 로컬 서버로 재생하고, 전체 파서를 N번 실행해
+단계별 소요 시간의 p50/p95를 출력합니다. 포털에 접속하지 않습니다.
+
+실행:
+    APTI_RECORD_DIR=.apti/fixtures python apti_parser.py   # 한 번 실제로 수집하며 페이지 저장
+    python apti_bench.py .apti/fixtures --runs 10
+"""
+
+import argparse
+import asyncio
+import math
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from selectolax.parser import HTMLParser
+
+from apti_parser import (
+    ENGINE_HTTP,
+    ENGINE_PLAYWRIGHT,
+    APTiParser,
+    SpanRecorder,
+    extract_sections,
+    fixture_name,
+    write_trace,
+)
+
+# 로그인 함수 대역 (se_token 쿠키만 설정)
+LOGIN_STUB = (
+    "<script>function loginHtml(type) {"
+    " document.cookie = 'se_token=replay; path=/'; }</script>"
+)
+
+# 출력할 단계 (카테고리, 이름)
+PHASES = (
+    ("browser", "브라우저"),
+    ("login", "로그인"),
+    ("navigate", "페이지 이동"),
+    ("wait", "대기"),
+    ("fetch", "수집"),
+)
+
+
+def percentile(values: list, p: float) -> float:
+    """최근접 순위 백분위수."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+def start_replay_server(fixture_dir: str) -> ThreadingHTTPServer:
+    """저장한 페이지를 재생하는 로컬 서버 시작."""
+    home = fixture_name(APTiParser.HOME_PAGE)
+
+    class ReplayHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            name = fixture_name(self.path)
+            try:
+                with open(os.path.join(fixture_dir, name), encoding="utf-8") as f:
+                    html = f.read()
+            except FileNotFoundError:
+                self.send_error(404, f"fixture not found: {name}")
+                return
+
+            if name == home:
+                html = html.replace("</body>", f"{LOGIN_STUB}</body>", 1)
+                if LOGIN_STUB not in html:
+                    html += LOGIN_STUB
+
+            body = html.encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ReplayHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+async def bench_parser(base_url: str, args) -> tuple[list, list]:
+    """파서를 runs번 실행하고 (실행별 SpanRecorder, 실행별 전체 시간) 반환."""
+    recorders = []
+    totals = []
+    for index in range(args.runs):
+        parser = APTiParser(
+            "bench", "bench", concurrency=args.concurrency, engine=args.engine
+        )
+        parser.BASE_URL = base_url
+        parser.spans = SpanRecorder(pid=index + 1, label=f"run {index + 1}")
+
+        start = time.perf_counter()
+        data = await parser.run()
+        totals.append(time.perf_counter() - start)
+        if not data or not data["maint_items"]:
+            print(f"실행 {index + 1}: 수집 결과 없음")
+        recorders.append(parser.spans)
+    return recorders, totals
+
+
+def bench_extractors(fixture_dir: str, runs: int) -> dict:
+    """페이지별 HTML 파싱 + 추출 시간(ms) 측정."""
+    results = {}
+    for path, _ready, keys in APTiParser("bench", "bench")._pages():
+        file_path = os.path.join(fixture_dir, fixture_name(path))
+        if not os.path.exists(file_path):
+            continue
+        with open(file_path, "rb") as f:
+            html = f.read()
+        times = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            extract_sections(HTMLParser(html), keys)
+            times.append((time.perf_counter() - start) * 1000)
+        results[path] = times
+    return results
+
+
+def print_report(recorders: list, totals: list, extract_times: dict) -> None:
+    """단계별 p50/p95 출력."""
+    print(f"\n=== 벤치마크 ({len(recorders)}회) ===")
+    print(f"{'단계':<12} {'p50':>9} {'p95':>9}")
+    rows = [
+        (label, [recorder.totals().get(cat, (0.0, 0, 0))[0] for recorder in recorders])
+        for cat, label in PHASES
+    ]
+    rows.append(("전체", totals))
+    for label, values in rows:
+        if any(values):
+            print(f"{label:<12} {percentile(values, 50):>8.3f}s {percentile(values, 95):>8.3f}s")
+
+    if extract_times:
+        print(f"\n{'추출 (HTML 파싱 포함)':<48} {'p50':>9} {'p95':>9}")
+        for path, times in extract_times.items():
+            print(
+                f"{path:<48} {percentile(times, 50):>7.2f}ms {percentile(times, 95):>7.2f}ms"
+            )
+
+
+async def main():
+    """메인."""
+    arg_parser = argparse.ArgumentParser(description="APT.i 파서 오프라인 벤치마크")
+    arg_parser.add_argument("fixtures", help="APTI_RECORD_DIR로 저장한 페이지 폴더")
+    arg_parser.add_argument("--runs", type=int, default=5, help="실행 횟수")
+    arg_parser.add_argument(
+        "--engine", choices=(ENGINE_PLAYWRIGHT, ENGINE_HTTP), default=ENGINE_PLAYWRIGHT
+    )
+    arg_parser.add_argument("--concurrency", type=int, default=1)
+    arg_parser.add_argument("--trace", help="Chrome trace JSON 저장 경로")
+    args = arg_parser.parse_args()
+
+    server = start_replay_server(args.fixtures)
+    try:
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+        recorders, totals = await bench_parser(base_url, args)
+    finally:
+        server.shutdown()
+
+    print_report(recorders, totals, bench_extractors(args.fixtures, max(args.runs, 20)))
+    if args.trace:
+        write_trace(args.trace, recorders)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,14 +1,192 @@
 """APT.i Playwright 파서 - GitHub Actions용."""
 
 import asyncio
+import base64
+import contextlib
+import contextvars
+import functools
+import gzip
+import hashlib
+import hmac
 import json
 import os
+import random
 import re
+import secrets
 import sys
+import time
 from datetime import datetime
 
 import httpx
+from cryptography.fernet import Fernet, InvalidToken
+from playwright.async_api import Error as PlaywrightError
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 from playwright.async_api import async_playwright
+from selectolax.parser import HTMLParser
+
+try:
+    import zstandard
+except ImportError:  # zstd는 선택 사항
+    zstandard = None
+
+try:
+    import h2
+except ImportError:  # HTTP/2는 선택 사항
+    h2 = None
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+
+# Webhook으로 전달하는 데이터 섹션
+SECTIONS = (
+    "maint_items",
+    "maint_payment",
+    "energy_category",
+    "energy_type",
+    "payment_history",
+)
+
+ENGINE_PLAYWRIGHT = "playwright"
+ENGINE_HTTP = "http"
+
+# Webhook 전송 결과
+SEND_OK = "sent"
+SEND_QUEUED = "queued"  # 재시도 실패, outbox에 저장
+SEND_FAILED = "failed"
+
+
+# 모든 계정의 span 시각 기준점 (배치 실행 시 하나의 타임라인으로 합침)
+_TRACE_ORIGIN = time.perf_counter()
+
+# 현재 작업(계정)의 Webhook 전송 [요청 수, 바이트] (배치 실행 시 계정별 span 기록용)
+_SEND_COUNTERS: contextvars.ContextVar[list | None] = contextvars.ContextVar(
+    "apti_send_counters", default=None
+)
+
+
+class SpanRecorder:
+    """단계별 소요 시간 기록.
+
+    span마다 실제 경과 시간과 그동안의 요청 수/전송량을 기록하고,
+    Chrome trace event 형식(chrome://tracing, Perfetto)으로 내보냅니다.
+    """
+
+    # 요약에 표시할 단계 (카테고리, 이름)
+    SUMMARY_CATEGORIES = (
+        ("browser", "브라우저"),
+        ("session", "세션"),
+        ("login", "로그인"),
+        ("fetch", "수집"),
+        ("send", "전송"),
+    )
+
+    def __init__(self, pid: int = 1, label: str = "APT.i") -> None:
+        """초기화 (pid는 trace에서 계정 구분용)."""
+        self.pid = pid
+        self.label = label
+        self.events: list = []
+        self._tids: dict = {}
+
+    def _tid(self) -> int:
+        """현재 작업(탭)별 트랙 번호."""
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+        return self._tids.setdefault(id(task), len(self._tids) + 1)
+
+    @contextlib.contextmanager
+    def span(self, name: str, cat: str, counters=None):
+        """구간 기록. counters는 (요청 수, 전송 바이트)를 반환하는 함수.
+
+        yield한 dict에 값을 넣으면 이벤트 args에 함께 기록됩니다.
+        """
+        args: dict = {}
+        before = counters() if counters else None
+        tid = self._tid()
+        start = time.perf_counter()
+        try:
+            yield args
+        finally:
+            end = time.perf_counter()
+            if before is not None:
+                after = counters()
+                args.setdefault("requests", after[0] - before[0])
+                args.setdefault("bytes", after[1] - before[1])
+            self.events.append({
+                "name": name,
+                "cat": cat,
+                "ph": "X",
+                "ts": round((start - _TRACE_ORIGIN) * 1e6),
+                "dur": round((end - start) * 1e6),
+                "pid": self.pid,
+                "tid": tid,
+                "args": args,
+            })
+
+    def totals(self) -> dict:
+        """카테고리별 (시간 합계 초, 요청 수, 전송 바이트)."""
+        totals: dict = {}
+        for event in self.events:
+            seconds, requests, size = totals.get(event["cat"], (0.0, 0, 0))
+            totals[event["cat"]] = (
+                seconds + event["dur"] / 1e6,
+                requests + event["args"].get("requests", 0),
+                size + event["args"].get("bytes", 0),
+            )
+        return totals
+
+    def summary(self) -> str:
+        """한 줄 요약."""
+        totals = self.totals()
+        # 이동/대기 구간은 다른 구간 안에 있으므로 요약에서 제외
+        phases = [
+            (label, totals[cat]) for cat, label in self.SUMMARY_CATEGORIES if cat in totals
+        ]
+        parts = [f"{label} {seconds:.2f}s" for label, (seconds, _, _) in phases]
+        requests = sum(requests for _, (_, requests, _) in phases)
+        size = sum(size for _, (_, _, size) in phases)
+        return f"[{self.label}] " + " | ".join(parts) + f" | 요청 {requests}건 {size / 1024:.1f}KB"
+
+    def trace_events(self) -> list:
+        """프로세스 이름 메타데이터를 포함한 trace 이벤트."""
+        meta = {
+            "name": "process_name",
+            "ph": "M",
+            "pid": self.pid,
+            "args": {"name": self.label},
+        }
+        return [meta, *self.events]
+
+
+def traced(cat: str):
+    """parser.spans로 비동기 메서드 실행 구간 기록."""
+
+    def decorator(func):
+        name = func.__name__.lstrip("_")
+
+        @functools.wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            with self.spans.span(name, cat, self._counters):
+                return await func(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def fixture_name(path: str) -> str:
+    """페이지 경로의 fixture 파일 이름 ("/apti/manage/manage_cost.asp?cate_code=AAEB"
+    → "apti_manage_manage_cost_asp_cate_code_AAEB.html")."""
+    return re.sub(r"[^A-Za-z0-9]+", "_", path).strip("_") + ".html"
+
+
+def write_trace(path: str, recorders: list) -> None:
+    """여러 기록을 하나의 Chrome trace JSON 파일로 저장."""
+    events = [event for recorder in recorders for event in recorder.trace_events()]
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, ensure_ascii=False)
+    print(f"trace 저장: {path} ({len(events)}개 이벤트)")
 
 
 def is_phone_number(text: str) -> bool:
@@ -16,41 +194,659 @@ def is_phone_number(text: str) -> bool:
     return bool(re.match(r"^0\d{9,10}$", text.replace("-", "")))
 
 
+def _text(node) -> str:
+    """노드 텍스트 (textContent.trim()과 동일)."""
+    return node.text().strip() if node is not None else ""
+
+
+def _closest(node, tag: str):
+    """가장 가까운 상위 태그."""
+    node = node.parent
+    while node is not None and node.tag != tag:
+        node = node.parent
+    return node
+
+
+def _next_element(node):
+    """다음 형제 요소 (텍스트 노드 제외)."""
+    node = node.next
+    while node is not None and node.tag in ("-text", "_comment"):
+        node = node.next
+    return node
+
+
+# 섹션별 추출 규칙 (Playwright와 HTTP 엔진이 함께 사용)
+#
+# 목록 섹션: rows(후보 셀렉터, 처음 일치하는 것 사용)의 각 요소에서 fields를 읽습니다.
+#   closest로 상위 요소로 올라가고, td가 min_cells개 미만이거나 require의 필드가
+#   비어 있거나 정규식과 맞지 않으면 건너뜁니다.
+#   stop_at 필드 값이 지난번 마지막 레코드(mark)와 같으면 그 앞까지만 읽습니다
+#   (최신 레코드가 위에 있는 표).
+# 객체 섹션: rows 없이 문서 전체에서 fields를 읽습니다.
+# 값 섹션: value 필드 하나를 읽습니다.
+#
+# 필드: sel(첫 일치 요소, 없으면 현재 요소) 또는 cell(td 위치), contains(텍스트 포함 요소만),
+#   before/after(구분 요소 앞/뒤의 요소만), inner(각 요소 안의 첫 일치 요소),
+#   last(마지막 일치 요소), next(바로 다음 형제 태그), clean(정리 규칙), match(정규식 첫 그룹)
+# pairs: 행마다 th → td를 필드로 추가
+SECTION_SPECS: dict[str, dict] = {
+    "dong_ho": {
+        "value": {"sel": "div.Nbox1_txt10", "clean": ["dong_ho"]},
+        "default": "",
+    },
+    "maint_items": {
+        "label": "관리비 항목",
+        "unit": "개",
+        "rows": ["a.black"],
+        "closest": "tr",
+        "min_cells": 4,
+        "fields": {
+            "item": {"sel": "a.black"},
+            "current": {"cell": 1, "clean": ["number"]},
+            "previous": {"cell": 2, "clean": ["number"]},
+            "change": {"cell": 3, "clean": ["number"]},
+        },
+    },
+    "maint_payment": {
+        "label": "관리비 납부액",
+        "unit": "원",
+        "fields": {
+            "amount": {"sel": "span.costPay", "clean": ["number"]},
+            "charged": {
+                "sel": "div.costpayBox dt",
+                "contains": "월분 부과 금액",
+                "next": "dd",
+                "clean": ["won"],
+            },
+            "month": {
+                "sel": "div.costpayBox dt",
+                "contains": "월분 부과 금액",
+                "match": r"(\d+)월분",
+            },
+            "deadline": {"sel": "div.endBox span"},
+            "status": {"sel": "div.dayBox p"},
+        },
+    },
+    "energy_category": {
+        "label": "에너지 카테고리",
+        "unit": "개",
+        "rows": ["div.engBox"],
+        "require": {"type": ""},
+        "defaults": {"usage": "0", "cost": "0", "comparison": ""},
+        "fields": {
+            "type": {"sel": "h3", "clean": ["squash"]},
+            # 구분선(li.line) 앞은 사용량, 뒤는 요금 (각각 마지막 값)
+            "usage": {
+                "sel": "ul.engUnit li",
+                "before": "li.line",
+                "inner": "strong",
+                "last": True,
+                "clean": ["number"],
+            },
+            "cost": {
+                "sel": "ul.engUnit li",
+                "after": "li.line",
+                "inner": "strong",
+                "last": True,
+                "clean": ["won"],
+            },
+            "comparison": {"sel": "div.txtBox strong"},
+        },
+    },
+    "energy_type": {
+        "label": "에너지 종류별",
+        "unit": "개",
+        "rows": ["div.bill_box"],
+        "require": {"type": ""},
+        "fields": {
+            "type": {"sel": "h3", "clean": ["squash"]},
+            "total": {"sel": "span.totalBill strong", "clean": ["number"]},
+            "comparison": {"sel": "div.energy_data p.txt"},
+        },
+        "pairs": {"rows": "div.tbl_bill tr", "clean": ["won"]},
+    },
+    "payment_history": {
+        "label": "납부내역",
+        "unit": "건",
+        "rows": ["div#hidden-xs2 table.table-w tbody tr", "table.table-w tbody tr"],
+        "min_cells": 7,
+        "require": {"date": r"\d{4}\.\d{2}\.\d{2}"},
+        "stop_at": ["date", "billing_month"],
+        "fields": {
+            "date": {"cell": 0},
+            "amount": {"cell": 1, "clean": ["number"]},
+            "billing_month": {"cell": 2},
+            "deadline": {"cell": 3},
+            "bank": {"cell": 4},
+            "method": {"cell": 5},
+            "status": {"cell": 6},
+        },
+    },
+}
+
+
+# 지난번 마지막 레코드 이후만 읽는 섹션
+MARKED_SECTIONS = tuple(key for key, spec in SECTION_SPECS.items() if "stop_at" in spec)
+
+
+def _format_dong_ho(text: str) -> str:
+    """"1306동 1001호" → "13061001"."""
+    match = re.search(r"(\d+)동\s*(\d+)호", text)
+    return match[1].zfill(4) + match[2].zfill(4) if match else ""
+
+
+# 정리 규칙 (앞뒤 공백 제거 후 순서대로 적용, _EXTRACT_JS의 rules와 같아야 함)
+CLEAN_RULES = {
+    "number": lambda value: value.replace(",", ""),
+    "won": lambda value: re.sub(r"[원,]", "", value),
+    "squash": lambda value: re.sub(r"[\n\t]", "", value),
+    "dong_ho": _format_dong_ho,
+}
+
+
+def _split(nodes: list, spec: dict) -> list:
+    """첫 구분 요소(before/after) 앞 또는 뒤의 요소 (구분 요소는 제외)."""
+    marker = spec.get("before") or spec["after"]
+    index = next((i for i, n in enumerate(nodes) if n.css_matches(marker)), None)
+    if "before" in spec:
+        return nodes if index is None else nodes[:index]
+    if index is None:
+        return []
+    return [n for n in nodes[index + 1:] if not n.css_matches(marker)]
+
+
+def _field(scope, spec: dict) -> str | None:
+    """필드 하나 읽기 (요소가 없으면 None)."""
+    node = scope
+    if "cell" in spec:
+        cells = scope.css("td")
+        node = cells[spec["cell"]] if spec["cell"] < len(cells) else None
+    elif spec.get("sel"):
+        nodes = scope.css(spec["sel"])
+        if "contains" in spec:
+            nodes = [n for n in nodes if spec["contains"] in n.text()]
+        if "before" in spec or "after" in spec:
+            nodes = _split(nodes, spec)
+        if "inner" in spec:
+            nodes = [n.css_first(spec["inner"]) for n in nodes]
+            nodes = [n for n in nodes if n is not None]
+        node = (nodes[-1] if spec.get("last") else nodes[0]) if nodes else None
+    if node is not None and "next" in spec:
+        node = _next_element(node)
+        if node is not None and node.tag != spec["next"]:
+            node = None
+    if node is None:
+        return None
+
+    value = node.text().strip()
+    for rule in spec.get("clean", ()):
+        value = CLEAN_RULES[rule](value)
+    if "match" in spec:
+        match = re.search(spec["match"], value)
+        value = match[1] if match else None
+    return value
+
+
+def _record(scope, spec: dict) -> dict:
+    """요소 하나에서 레코드 읽기."""
+    result = dict(spec.get("defaults", {}))
+    for name, field_spec in spec["fields"].items():
+        value = _field(scope, field_spec)
+        if value is not None:
+            result[name] = value
+    pairs = spec.get("pairs")
+    if pairs:
+        for row in scope.css(pairs["rows"]):
+            for th, td in zip(row.css("th"), row.css("td")):
+                result[_text(th)] = _field(td, {"clean": pairs["clean"]})
+    return result
+
+
+def _section(tree: HTMLParser, spec: dict, mark: list | None = None):
+    """섹션 하나 추출 (mark가 있으면 그 레코드 앞까지)."""
+    if "value" in spec:
+        value = _field(tree, spec["value"])
+        return spec["default"] if value is None else value
+    if "rows" not in spec:
+        return _record(tree, spec)
+
+    nodes = []
+    for selector in spec["rows"]:
+        nodes = tree.css(selector)
+        if nodes:
+            break
+    results = []
+    for node in nodes:
+        if "closest" in spec:
+            node = _closest(node, spec["closest"])
+        if node is None or len(node.css("td")) < spec.get("min_cells", 0):
+            continue
+        record = _record(node, spec)
+        if all(
+            record.get(name) and re.search(pattern, record[name])
+            for name, pattern in spec.get("require", {}).items()
+        ):
+            if mark and record_mark(spec, record) == mark:
+                break
+            results.append(record)
+    return results
+
+
+def record_mark(spec: dict, record: dict) -> list:
+    """레코드의 stop_at 필드 값."""
+    return [record.get(name) for name in spec["stop_at"]]
+
+
+def extract_sections(tree: HTMLParser, keys: tuple, marks: dict | None = None) -> dict:
+    """HTML에서 섹션 추출 (HTTP 엔진, page_script와 같은 결과)."""
+    marks = marks or {}
+    return {key: _section(tree, SECTION_SPECS[key], marks.get(key)) for key in keys}
+
+
+def describe_section(key: str, value) -> str | None:
+    """수집 결과 한 줄 요약 (label이 없는 섹션은 None)."""
+    spec = SECTION_SPECS[key]
+    if "label" not in spec:
+        return None
+    if isinstance(value, dict):
+        return f"{spec['label']}: {value.get('amount', 'N/A')}{spec['unit']}"
+    return f"{spec['label']}: {len(value)}{spec['unit']}"
+
+
+# SECTION_SPECS 해석기 (브라우저에서 실행, extract_sections와 같은 규칙)
+_EXTRACT_JS = r"""
+(sections, marks) => {
+    const rules = {
+        number: (v) => v.replace(/,/g, ''),
+        won: (v) => v.replace(/[원,]/g, ''),
+        squash: (v) => v.replace(/[\n\t]/g, ''),
+        dong_ho: (v) => {
+            const m = v.match(/(\d+)동\s*(\d+)호/);
+            return m ? m[1].padStart(4, '0') + m[2].padStart(4, '0') : '';
+        },
+    };
+    const field = (scope, spec) => {
+        let node = scope;
+        if (spec.cell !== undefined) {
+            node = scope.querySelectorAll('td')[spec.cell];
+        } else if (spec.sel) {
+            let nodes = Array.from(scope.querySelectorAll(spec.sel));
+            if (spec.contains) nodes = nodes.filter((n) => n.textContent.includes(spec.contains));
+            if (spec.before || spec.after) {
+                const marker = spec.before || spec.after;
+                const index = nodes.findIndex((n) => n.matches(marker));
+                if (spec.before) {
+                    if (index >= 0) nodes = nodes.slice(0, index);
+                } else {
+                    nodes = index < 0 ? [] : nodes.slice(index + 1).filter((n) => !n.matches(marker));
+                }
+            }
+            if (spec.inner) nodes = nodes.map((n) => n.querySelector(spec.inner)).filter((n) => n);
+            node = spec.last ? nodes[nodes.length - 1] : nodes[0];
+        }
+        if (node && spec.next) {
+            node = node.nextElementSibling;
+            if (node && node.tagName.toLowerCase() !== spec.next) node = null;
+        }
+        if (!node) return null;
+        let value = node.textContent.trim();
+        for (const rule of spec.clean || []) value = rules[rule](value);
+        if (spec.match) {
+            const m = value.match(new RegExp(spec.match));
+            value = m ? m[1] : null;
+        }
+        return value;
+    };
+    const record = (scope, spec) => {
+        const result = Object.assign({}, spec.defaults);
+        for (const [name, fieldSpec] of Object.entries(spec.fields)) {
+            const value = field(scope, fieldSpec);
+            if (value !== null) result[name] = value;
+        }
+        if (spec.pairs) {
+            for (const row of scope.querySelectorAll(spec.pairs.rows)) {
+                const ths = row.querySelectorAll('th');
+                const tds = row.querySelectorAll('td');
+                for (let i = 0; i < ths.length && i < tds.length; i++) {
+                    result[ths[i].textContent.trim()] = field(tds[i], { clean: spec.pairs.clean });
+                }
+            }
+        }
+        return result;
+    };
+    const section = (spec) => {
+        const mark = spec.stop_at && marks[spec.key];
+        if (spec.value) {
+            const value = field(document, spec.value);
+            return value === null ? spec.default : value;
+        }
+        if (!spec.rows) return record(document, spec);
+
+        let nodes = [];
+        for (const selector of spec.rows) {
+            nodes = document.querySelectorAll(selector);
+            if (nodes.length) break;
+        }
+        const results = [];
+        for (let node of nodes) {
+            if (spec.closest) node = node.closest(spec.closest);
+            if (!node || node.querySelectorAll('td').length < (spec.min_cells || 0)) continue;
+            const item = record(node, spec);
+            const ok = Object.entries(spec.require || {}).every(
+                ([name, pattern]) => item[name] && new RegExp(pattern).test(item[name])
+            );
+            if (!ok) continue;
+            if (mark && spec.stop_at.every((name, i) => item[name] === mark[i])) break;
+            results.push(item);
+        }
+        return results;
+    };
+    return Object.fromEntries(sections.map((spec) => [spec.key, section(spec)]));
+}
+"""
+
+
+@functools.lru_cache(maxsize=None)
+def page_script(keys: tuple) -> str:
+    """페이지의 섹션을 한 번의 evaluate로 모두 추출하는 스크립트 (인자: marks)."""
+    specs = [{"key": key, **SECTION_SPECS[key]} for key in keys]
+    return f"(marks) => ({_EXTRACT_JS.strip()})({json.dumps(specs, ensure_ascii=False)}, marks)"
+
+
 class APTiParser:
     """APT.i 파서."""
 
     BASE_URL = "https://xn--3-v85erd9xh0vctai95f4a637hvqbda945jmkaw30h.apti.co.kr"
 
-    def __init__(self, user_id: str, password: str) -> None:
-        """초기화."""
+    # 페이지 경로
+    HOME_PAGE = "/aptHome/"
+    DONG_HO_PAGE = "/aptHome/subpage/?cate_code=AAEB"
+    MAINT_PAGE = "/apti/manage/manage_cost.asp?cate_code=AAEB"
+    ENERGY_PAGE = "/apti/manage/manage_energy.asp?cate_code=AAEC"
+    ENERGY_GOGI_PAGE = "/apti/manage/manage_energyGogi.asp"
+    PAYMENT_PAGE = "/apti/manage/manage_check.asp?cate_code=AAFH"
+
+    # 준비 대기 최대 시간 (초)
+    READY_TIMEOUT = 10.0
+    # 저장된 세션 확인 대기 시간 (초)
+    PROBE_TIMEOUT = 3.0
+
+    # 추출에 쓰지 않는 리소스 (요청 차단)
+    BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media", "stylesheet"})
+    BLOCKED_URL_PATTERNS = (
+        "google-analytics.com",
+        "googletagmanager.com",
+        "doubleclick.net",
+        "googlesyndication.com",
+        "facebook.net",
+        "wcs.naver.net",
+    )
+    # 차단 규칙보다 우선하는 스크립트 (단지 홈페이지 외부에서 loginHtml이 쓰는 스크립트)
+    ALLOWED_SCRIPT_PATTERNS = ("jquery",)
+
+    def __init__(
+        self,
+        user_id: str,
+        password: str,
+        concurrency: int = 1,
+        engine: str = ENGINE_PLAYWRIGHT,
+        state_dir: str | None = None,
+        block_resources: bool = True,
+        browser=None,
+        record_dir: str | None = None,
+    ) -> None:
+        """초기화.
+
+        concurrency가 2 이상이면 로그인 후 여러 탭에서 동시에 수집합니다.
+        engine이 "http"이면 로그인 후 브라우저 없이 httpx로 수집하고,
+        실패하면 Playwright로 다시 수집합니다.
+        state_dir을 지정하면 로그인 세션을 암호화해 저장하고 다음 실행에 재사용합니다.
+        block_resources가 참이면 이미지, 폰트, CSS, 광고/분석 스크립트 요청을 차단합니다.
+        browser를 넘기면 그 브라우저에 이 계정 전용 컨텍스트만 만들어 사용합니다.
+        record_dir을 지정하면 불러온 페이지의 DOM을 fixture로 저장합니다 (apti_bench.py용).
+        이때는 로그인 페이지도 저장하도록 저장된 세션을 쓰지 않고 새로 로그인합니다.
+        """
         self.user_id = user_id
         self.password = password
+        self.concurrency = max(1, concurrency)
+        self.engine = engine
+        self.state_dir = state_dir
+        self.block_resources = block_resources
+        self.record_dir = record_dir
         self._playwright = None
         self._browser = None
+        self._shared_browser = browser
+        self._context = None
         self._page = None
+        self._cookies: list = []
+        # 섹션별 지난번 마지막 레코드 (이 레코드 앞의 새 레코드만 수집)
+        self.marks: dict = {}
+        # 탭별로 로드된 URL (같은 URL은 다시 이동하지 않음)
+        self._loaded_urls: dict = {}
+        self.stats = {
+            "page_loads": 0,
+            "page_cache_hits": 0,
+            "wait_times": {},
+            "fetch_times": {},
+            "session_reused": False,
+            "requests": 0,
+            "transferred_bytes": 0,
+            "blocked_requests": {},
+        }
+        # 단계별 소요 시간 (APTI_TRACE_FILE로 내보내기)
+        self.spans = SpanRecorder()
+
+    def _counters(self) -> tuple:
+        """span 기록용 (요청 수, 전송 바이트)."""
+        return self.stats["requests"], self.stats["transferred_bytes"]
 
+    @traced("browser")
     async def _init_browser(self) -> None:
         """브라우저 초기화."""
-        self._playwright = await async_playwright().start()
-        self._browser = await self._playwright.chromium.launch(headless=True)
-        context = await self._browser.new_context(
-            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-        )
+        if self._shared_browser is not None:
+            self._browser = self._shared_browser
+        else:
+            self._playwright = await async_playwright().start()
+            self._browser = await self._playwright.chromium.launch(headless=True)
+        context = self._context = await self._browser.new_context(user_agent=USER_AGENT)
+        if self._cookies:
+            await context.add_cookies(self._cookies)
+        if self.block_resources:
+            await context.route("**/*", self._route)
+        context.on("requestfinished", self._on_request_finished)
         self._page = await context.new_page()
 
+    def _should_block(self, resource_type: str, url: str) -> bool:
+        """차단할 요청인지 확인."""
+        if resource_type == "script" and (
+            url.startswith(self.BASE_URL)
+            or any(pattern in url for pattern in self.ALLOWED_SCRIPT_PATTERNS)
+        ):
+            return False
+        return resource_type in self.BLOCKED_RESOURCE_TYPES or any(
+            pattern in url for pattern in self.BLOCKED_URL_PATTERNS
+        )
+
+    async def _route(self, route) -> None:
+        """요청 차단 라우터."""
+        request = route.request
+        if self._should_block(request.resource_type, request.url):
+            blocked = self.stats["blocked_requests"]
+            blocked[request.resource_type] = blocked.get(request.resource_type, 0) + 1
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def _on_request_finished(self, request) -> None:
+        """완료된 요청의 전송량 기록."""
+        self.stats["requests"] += 1
+        try:
+            sizes = await request.sizes()
+        except PlaywrightError:
+            return
+        self.stats["transferred_bytes"] += (
+            sizes["responseHeadersSize"] + sizes["responseBodySize"]
+        )
+
     async def _close_browser(self) -> None:
-        """브라우저 종료."""
-        if self._browser:
+        """브라우저 종료 (공유 브라우저는 이 계정의 컨텍스트만 닫음)."""
+        if self._context:
+            await self._context.close()
+        if self._browser and self._browser is not self._shared_browser:
             await self._browser.close()
         if self._playwright:
             await self._playwright.stop()
+        self._browser = None
+        self._playwright = None
+        self._context = None
+        self._page = None
+        self._loaded_urls.clear()
+
+    async def _open(
+        self, page, path: str, ready: str, timeout: float | None = None
+    ) -> bool:
+        """페이지 이동 후 ready 셀렉터가 나타날 때까지 대기.
+
+        해당 탭에 이미 로드된 페이지면 이동하지 않고 현재 DOM을 재사용합니다.
+        """
+        url = f"{self.BASE_URL}{path}"
+        navigated = self._loaded_urls.get(page) != url
+        if not navigated:
+            self.stats["page_cache_hits"] += 1
+        else:
+            self._loaded_urls.pop(page, None)
+            with self.spans.span(f"goto {path}", "navigate", self._counters):
+                await page.goto(url, wait_until="domcontentloaded")
+            self._loaded_urls[page] = url
+            self.stats["page_loads"] += 1
+
+        loaded = await self._wait_ready(path, page.wait_for_selector(
+            ready, state="attached", timeout=(timeout or self.READY_TIMEOUT) * 1000
+        ))
+        if loaded and navigated and self.record_dir:
+            await self._record_fixture(page, path)
+        return loaded
+
+    async def _record_fixture(self, page, path: str) -> None:
+        """현재 DOM을 fixture로 저장 (스크립트는 제거해 정적 페이지로)."""
+        html = re.sub(
+            r"<script\b[^>]*>.*?</script>", "", await page.content(), flags=re.S | re.I
+        )
+        os.makedirs(self.record_dir, exist_ok=True)
+        with open(os.path.join(self.record_dir, fixture_name(path)), "w", encoding="utf-8") as f:
+            f.write(html)
+
+    async def _wait_ready(self, label: str, waiter) -> bool:
+        """준비 조건 대기 (시간 초과 시 경고만 출력)."""
+        start = time.monotonic()
+        try:
+            with self.spans.span(f"wait {label}", "wait"):
+                await waiter
+            return True
+        except PlaywrightTimeoutError:
+            print(f"대기 시간 초과: {label}")
+            return False
+        finally:
+            waits = self.stats["wait_times"]
+            waits[label] = waits.get(label, 0.0) + time.monotonic() - start
+
+    async def _wait_for_cookie(self, name: str) -> bool:
+        """쿠키가 생길 때까지 대기."""
+        deadline = time.monotonic() + self.READY_TIMEOUT
+        while time.monotonic() < deadline:
+            cookies = await self._page.context.cookies()
+            if any(name in cookie["name"] for cookie in cookies):
+                return True
+            await asyncio.sleep(0.2)
+        raise PlaywrightTimeoutError(f"{name} 쿠키 대기 시간 초과")
+
+    def state_file(self, kind: str, ext: str) -> str | None:
+        """계정별 상태 파일 경로 (state_dir이 없으면 None)."""
+        if not self.state_dir:
+            return None
+        account = hashlib.sha256(self.user_id.encode()).hexdigest()[:16]
+        return os.path.join(self.state_dir, f"{kind}_{account}.{ext}")
+
+    def _session_fernet(self, salt: bytes) -> Fernet:
+        """비밀번호에서 세션 암호화 키 생성."""
+        key = hashlib.pbkdf2_hmac("sha256", self.password.encode(), salt, 200_000)
+        return Fernet(base64.urlsafe_b64encode(key))
+
+    def _load_session(self) -> list:
+        """저장된 세션 쿠키 읽기 (없거나 만료되면 빈 목록)."""
+        if not self.state_dir:
+            return []
+        try:
+            with open(self.state_file("session", "bin"), "rb") as f:
+                raw = f.read()
+            cookies = json.loads(self._session_fernet(raw[:16]).decrypt(raw[16:]))
+        except FileNotFoundError:
+            return []
+        except (InvalidToken, ValueError) as e:
+            print(f"저장된 세션 읽기 실패: {e!r}")
+            return []
+
+        now = time.time()
+        cookies = [
+            c for c in cookies
+            if c.get("expires", -1) in (-1, None) or c["expires"] > now
+        ]
+        if not any("se_token" in c["name"] for c in cookies):
+            return []
+        return cookies
+
+    def _save_session(self) -> None:
+        """세션 쿠키를 암호화해 저장."""
+        if not self.state_dir or not self._cookies:
+            return
+        os.makedirs(self.state_dir, exist_ok=True)
+        salt = os.urandom(16)
+        token = self._session_fernet(salt).encrypt(json.dumps(self._cookies).encode())
+        path = self.state_file("session", "bin")
+        with open(f"{path}.tmp", "wb") as f:
+            f.write(salt + token)
+        os.replace(f"{path}.tmp", path)
+
+    @traced("session")
+    async def _probe_session(self) -> bool:
+        """저장된 세션으로 동호 페이지가 열리는지 확인 (Playwright).
+
+        리다이렉트/오류 페이지에도 같은 요소가 있을 수 있으므로 동호가 읽혀야 유효합니다.
+        """
+        if not await self._open(
+            self._page, self.DONG_HO_PAGE, "div.Nbox1_txt10", timeout=self.PROBE_TIMEOUT
+        ):
+            return False
+        try:
+            result = await self._page.evaluate(page_script(("dong_ho",)), {})
+        except PlaywrightError:
+            result = {}
+        if result.get("dong_ho"):
+            return True
+        # 로그인 후 이 DOM을 재사용하지 않도록
+        self._loaded_urls.pop(self._page, None)
+        return False
+
+    @traced("session")
+    async def _probe_session_http(self) -> bool:
+        """저장된 세션으로 동호 페이지가 열리는지 확인 (HTTP)."""
+        async with self._http_client() as client:
+            try:
+                response = await client.get(self.DONG_HO_PAGE, timeout=self.PROBE_TIMEOUT)
+            except httpx.HTTPError:
+                return False
+        return bool(extract_sections(HTMLParser(response.content), ("dong_ho",))["dong_ho"])
 
+    @traced("login")
     async def login(self) -> bool:
         """로그인."""
         print("로그인 시작...")
 
-        await self._page.goto(f"{self.BASE_URL}/aptHome/", wait_until="networkidle")
-        await asyncio.sleep(2)
+        await self._open(self._page, self.HOME_PAGE, "input[name='login_id']")
+        await self._wait_ready(self.HOME_PAGE, self._page.wait_for_function(
+            "() => typeof loginHtml === 'function'",
+            timeout=self.READY_TIMEOUT * 1000,
+        ))
 
         is_phone = is_phone_number(self.user_id)
 
@@ -61,7 +857,6 @@ class APTiParser:
                     document.querySelectorAll('.hideID').forEach(el => el.style.display = 'none');
                 }
             """)
-            await asyncio.sleep(0.5)
 
             await self._page.evaluate(f"""
                 () => {{
@@ -75,21 +870,22 @@ class APTiParser:
             await self._page.fill("input[name='login_pwd']", self.password)
             await self._page.evaluate("loginHtml('I')")
 
-        await asyncio.sleep(3)
-        await self._page.wait_for_load_state("networkidle")
+        logged_in = await self._wait_ready("login", self._wait_for_cookie("se_token"))
+        # 로그인 후 페이지가 바뀌었으므로 캐시 무효화
+        self._loaded_urls.pop(self._page, None)
 
-        cookies = await self._page.context.cookies()
-        for cookie in cookies:
-            if "se_token" in cookie["name"]:
-                print("로그인 성공!")
-                return True
+        if logged_in:
+            self._cookies = await self._page.context.cookies()
+            print("로그인 성공!")
+            return True
 
         print("로그인 실패!")
         return False
 
-    async def fetch_all_data(self) -> dict:
-        """모든 데이터 수집."""
-        data = {
+    @staticmethod
+    def _empty_data() -> dict:
+        """빈 수집 결과."""
+        return {
             "timestamp": datetime.now().isoformat(),
             "dong_ho": "",
             "maint_items": [],
@@ -99,291 +895,697 @@ class APTiParser:
             "payment_history": [],
         }
 
-        # 동호 정보
-        data["dong_ho"] = await self._get_dong_ho()
-
-        # 관리비 항목
-        data["maint_items"] = await self._fetch_maint_items()
+    async def fetch_all_data(self) -> dict:
+        """모든 데이터 수집."""
+        data = self._empty_data()
 
-        # 관리비 납부액
-        data["maint_payment"] = await self._fetch_maint_payment()
+        if self.concurrency > 1:
+            await self._fetch_concurrently(data)
+        else:
+            for path, ready, keys in self._pages():
+                data.update(await self._timed(path, self._fetch_page(self._page, path, ready, keys)))
 
-        # 에너지 카테고리
-        data["energy_category"] = await self._fetch_energy_category()
+        return data
 
-        # 에너지 종류별
-        data["energy_type"] = await self._fetch_energy_type()
+    def _pages(self) -> list:
+        """(페이지 경로, ready 셀렉터, 섹션 키) 목록 (페이지마다 한 번 이동, 한 번 추출)."""
+        return [
+            # 동호 정보
+            (self.DONG_HO_PAGE, "div.Nbox1_txt10", ("dong_ho",)),
+            # 관리비 항목, 관리비 납부액
+            (self.MAINT_PAGE, "a.black", ("maint_items", "maint_payment")),
+            # 에너지 카테고리
+            (self.ENERGY_PAGE, "div.engBox", ("energy_category",)),
+            # 에너지 종류별
+            (self.ENERGY_GOGI_PAGE, "div.bill_box", ("energy_type",)),
+            # 납부내역
+            (self.PAYMENT_PAGE, "table.table-w", ("payment_history",)),
+        ]
 
-        # 납부내역
-        data["payment_history"] = await self._fetch_payment_history()
+    async def _fetch_concurrently(self, data: dict) -> None:
+        """탭 풀에서 페이지별로 동시 수집."""
+        pages = self._pages()
+        pool: asyncio.Queue = asyncio.Queue()
+        pool.put_nowait(self._page)
+        extra_pages = []
+        for _ in range(min(self.concurrency, len(pages)) - 1):
+            page = await self._page.context.new_page()
+            extra_pages.append(page)
+            pool.put_nowait(page)
 
-        return data
+        async def run_page(path: str, ready: str, keys: tuple) -> None:
+            page = await pool.get()
+            try:
+                data.update(await self._timed(path, self._fetch_page(page, path, ready, keys)))
+            finally:
+                pool.put_nowait(page)
 
-    async def _get_dong_ho(self) -> str:
-        """동호 정보."""
         try:
-            url = f"{self.BASE_URL}/aptHome/subpage/?cate_code=AAEB"
-            await self._page.goto(url, wait_until="networkidle")
-            await asyncio.sleep(1)
-
-            dong_ho = await self._page.evaluate("""
-                () => {
-                    const elem = document.querySelector('div.Nbox1_txt10');
-                    if (elem) {
-                        const match = elem.textContent.match(/(\\d+)동\\s*(\\d+)호/);
-                        if (match) return match[1].padStart(4, '0') + match[2].padStart(4, '0');
-                    }
-                    return '';
-                }
-            """)
-            return dong_ho
-        except Exception as e:
-            print(f"동호 정보 오류: {e}")
-            return ""
+            await asyncio.gather(*(run_page(*spec) for spec in pages))
+        finally:
+            for page in extra_pages:
+                self._loaded_urls.pop(page, None)
+                await page.close()
 
-    async def _fetch_maint_items(self) -> list:
-        """관리비 항목."""
+    async def _timed(self, key: str, coro):
+        """수집기 실행 시간 기록."""
+        start = time.monotonic()
         try:
-            url = f"{self.BASE_URL}/apti/manage/manage_cost.asp?cate_code=AAEB"
-            await self._page.goto(url, wait_until="networkidle")
-            await asyncio.sleep(2)
-
-            items = await self._page.evaluate("""
-                () => {
-                    const results = [];
-                    const links = document.querySelectorAll('a.black');
-                    links.forEach(link => {
-                        const row = link.closest('tr');
-                        if (row) {
-                            const cells = row.querySelectorAll('td');
-                            if (cells.length >= 4) {
-                                results.push({
-                                    'item': link.textContent.trim(),
-                                    'current': cells[1].textContent.trim().replace(/,/g, ''),
-                                    'previous': cells[2].textContent.trim().replace(/,/g, ''),
-                                    'change': cells[3].textContent.trim().replace(/,/g, '')
-                                });
-                            }
-                        }
-                    });
-                    return results;
-                }
-            """)
-            print(f"관리비 항목: {len(items)}개")
-            return items
-        except Exception as e:
-            print(f"관리비 항목 오류: {e}")
-            return []
+            with self.spans.span(key, "fetch", self._counters):
+                return await coro
+        finally:
+            self.stats["fetch_times"][key] = time.monotonic() - start
 
-    async def _fetch_maint_payment(self) -> dict:
-        """관리비 납부액."""
+    async def _fetch_page(self, page, path: str, ready: str, keys: tuple) -> dict:
+        """페이지를 열고 섹션을 한 번의 evaluate로 추출 (실패하면 빈 dict)."""
         try:
-            url = f"{self.BASE_URL}/apti/manage/manage_cost.asp?cate_code=AAEB"
-            await self._page.goto(url, wait_until="networkidle")
-            await asyncio.sleep(2)
-
-            payment = await self._page.evaluate("""
-                () => {
-                    const result = {};
-                    const costPayElem = document.querySelector('span.costPay');
-                    if (costPayElem) {
-                        result['amount'] = costPayElem.textContent.trim().replace(/,/g, '');
-                    }
-                    const dtElements = document.querySelectorAll('div.costpayBox dt');
-                    for (const dt of dtElements) {
-                        const dtText = dt.textContent.trim();
-                        if (dtText.includes('월분 부과 금액')) {
-                            const dd = dt.nextElementSibling;
-                            if (dd && dd.tagName === 'DD') {
-                                result['charged'] = dd.textContent.trim().replace(/[원,]/g, '');
-                            }
-                            const monthMatch = dtText.match(/(\\d+)월분/);
-                            if (monthMatch) result['month'] = monthMatch[1];
-                            break;
-                        }
-                    }
-                    const deadlineElem = document.querySelector('div.endBox span');
-                    if (deadlineElem) result['deadline'] = deadlineElem.textContent.trim();
-                    const dayBox = document.querySelector('div.dayBox p');
-                    if (dayBox) result['status'] = dayBox.textContent.trim();
-                    return result;
-                }
-            """)
-            print(f"관리비 납부액: {payment.get('amount', 'N/A')}원")
-            return payment
+            await self._open(page, path, ready)
+            result = await page.evaluate(page_script(keys), self.marks)
         except Exception as e:
-            print(f"관리비 납부액 오류: {e}")
+            print(f"수집 오류 {path}: {e}")
             return {}
 
-    async def _fetch_energy_category(self) -> list:
-        """에너지 카테고리."""
-        try:
-            url = f"{self.BASE_URL}/apti/manage/manage_energy.asp?cate_code=AAEC"
-            await self._page.goto(url, wait_until="networkidle")
-            await asyncio.sleep(2)
+        for key, value in result.items():
+            line = describe_section(key, value)
+            if line:
+                print(line)
+        return result
 
-            data = await self._page.evaluate("""
-                () => {
-                    const results = [];
-                    const boxes = document.querySelectorAll('div.engBox');
-                    boxes.forEach(box => {
-                        const h3 = box.querySelector('h3');
-                        if (!h3) return;
-                        const energyType = h3.textContent.replace(/[\\n\\t]/g, '').trim();
-                        let usage = '0', cost = '0', comparison = '';
-                        const engUnit = box.querySelector('ul.engUnit');
-                        if (engUnit) {
-                            const lis = engUnit.querySelectorAll('li');
-                            let foundLine = false;
-                            for (const li of lis) {
-                                if (li.classList.contains('line')) { foundLine = true; continue; }
-                                const strong = li.querySelector('strong');
-                                if (strong) {
-                                    const text = strong.textContent.trim();
-                                    if (!foundLine) usage = text.replace(/,/g, '');
-                                    else cost = text.replace(/,/g, '').replace('원', '');
-                                }
-                            }
-                        }
-                        const txtBox = box.querySelector('div.txtBox');
-                        if (txtBox) {
-                            const compElem = txtBox.querySelector('strong');
-                            if (compElem) comparison = compElem.textContent.trim();
-                        }
-                        if (energyType) results.push({ type: energyType, usage, cost, comparison });
-                    });
-                    return results;
-                }
-            """)
-            print(f"에너지 카테고리: {len(data)}개")
-            return data
-        except Exception as e:
-            print(f"에너지 카테고리 오류: {e}")
-            return []
+    def _http_client(self) -> httpx.AsyncClient:
+        """로그인 쿠키를 가진 HTTP 클라이언트."""
+        cookies = httpx.Cookies()
+        for cookie in self._cookies:
+            cookies.set(
+                cookie["name"],
+                cookie["value"],
+                domain=cookie.get("domain", ""),
+                path=cookie.get("path", "/"),
+            )
+        return httpx.AsyncClient(
+            base_url=self.BASE_URL,
+            cookies=cookies,
+            headers={"User-Agent": USER_AGENT},
+            # 모든 페이지를 동시에 요청 (concurrency는 탭 수에만 적용)
+            limits=httpx.Limits(max_connections=len(self._pages())),
+            follow_redirects=True,
+            timeout=self.READY_TIMEOUT,
+        )
 
-    async def _fetch_energy_type(self) -> list:
-        """에너지 종류별."""
-        try:
-            url = f"{self.BASE_URL}/apti/manage/manage_energyGogi.asp"
-            await self._page.goto(url, wait_until="networkidle")
-            await asyncio.sleep(2)
+    async def fetch_all_data_http(self) -> dict | None:
+        """로그인 쿠키로 브라우저 없이 모든 데이터 수집.
 
-            data = await self._page.evaluate("""
-                () => {
-                    const results = [];
-                    const boxes = document.querySelectorAll('div.bill_box');
-                    boxes.forEach(box => {
-                        const info = {};
-                        const h3 = box.querySelector('h3');
-                        if (h3) info['type'] = h3.textContent.replace(/[\\n\\t]/g, '').trim();
-                        const totalElem = box.querySelector('span.totalBill strong');
-                        if (totalElem) info['total'] = totalElem.textContent.trim().replace(/,/g, '');
-                        const compareDiv = box.querySelector('div.energy_data');
-                        if (compareDiv) {
-                            const txt = compareDiv.querySelector('p.txt');
-                            if (txt) info['comparison'] = txt.textContent.trim();
-                        }
-                        const tblBill = box.querySelector('div.tbl_bill');
-                        if (tblBill) {
-                            const rows = tblBill.querySelectorAll('tr');
-                            rows.forEach(row => {
-                                const ths = row.querySelectorAll('th');
-                                const tds = row.querySelectorAll('td');
-                                for (let i = 0; i < ths.length && i < tds.length; i++) {
-                                    const key = ths[i].textContent.trim();
-                                    const value = tds[i].textContent.trim().replace('원', '').replace(/,/g, '');
-                                    info[key] = value;
-                                }
-                            });
-                        }
-                        if (info['type']) results.push(info);
-                    });
-                    return results;
-                }
-            """)
-            print(f"에너지 종류별: {len(data)}개")
-            return data
-        except Exception as e:
-            print(f"에너지 종류별 오류: {e}")
-            return []
+        세션이 유효하지 않아 관리비 정보를 읽지 못하면 None을 반환합니다.
+        """
+        data = self._empty_data()
 
-    async def _fetch_payment_history(self) -> list:
-        """납부내역."""
-        try:
-            url = f"{self.BASE_URL}/apti/manage/manage_check.asp?cate_code=AAFH"
-            await self._page.goto(url, wait_until="networkidle")
-            await asyncio.sleep(2)
+        async with self._http_client() as client:
 
-            data = await self._page.evaluate(r"""
-                () => {
-                    const results = [];
-                    let table = document.querySelector('div#hidden-xs2 table.table-w');
-                    if (!table) table = document.querySelector('table.table-w');
-                    if (table) {
-                        const tbody = table.querySelector('tbody');
-                        if (tbody) {
-                            const rows = tbody.querySelectorAll('tr');
-                            rows.forEach(row => {
-                                const cells = row.querySelectorAll('td');
-                                if (cells.length >= 7) {
-                                    const dateText = cells[0].textContent.trim();
-                                    if (dateText && dateText.match(/\d{4}\.\d{2}\.\d{2}/)) {
-                                        results.push({
-                                            date: dateText,
-                                            amount: cells[1].textContent.trim().replace(/,/g, ''),
-                                            billing_month: cells[2].textContent.trim(),
-                                            deadline: cells[3].textContent.trim(),
-                                            bank: cells[4].textContent.trim(),
-                                            method: cells[5].textContent.trim(),
-                                            status: cells[6].textContent.trim()
-                                        });
-                                    }
-                                }
-                            });
-                        }
-                    }
-                    return results;
-                }
-            """)
-            print(f"납부내역: {len(data)}건")
-            return data
-        except Exception as e:
-            print(f"납부내역 오류: {e}")
-            return []
+            async def fetch_page(path: str, keys: tuple) -> None:
+                start = time.monotonic()
+                with self.spans.span(path, "fetch") as args:
+                    response = await client.get(path)
+                    response.raise_for_status()
+                    self.stats["page_loads"] += 1
+                    args["requests"] = 1
+                    args["bytes"] = len(response.content)
+                    data.update(
+                        extract_sections(HTMLParser(response.content), keys, self.marks)
+                    )
+                self.stats["fetch_times"][path] = time.monotonic() - start
+
+            try:
+                await asyncio.gather(*(
+                    fetch_page(path, keys) for path, _ready, keys in self._pages()
+                ))
+            except httpx.HTTPError as e:
+                print(f"HTTP 수집 오류: {e}")
+                return None
+
+        if not data["maint_items"] and not data["maint_payment"]:
+            print("HTTP 수집 결과 없음 (세션 만료 또는 동적 페이지)")
+            return None
+
+        print(
+            f"HTTP 수집 완료 - 관리비 항목: {len(data['maint_items'])}개, "
+            f"에너지: {len(data['energy_category'])}개, "
+            f"납부내역: {len(data['payment_history'])}건"
+        )
+        return data
 
     async def run(self) -> dict | None:
         """실행."""
         try:
-            await self._init_browser()
-            if await self.login():
-                return await self.fetch_all_data()
-            return None
+            # 페이지 저장 중에는 로그인 페이지(HOME_PAGE)도 남도록 항상 새로 로그인
+            restored = not self.record_dir and await self._restore_session()
+            if not restored:
+                if self._browser is None:
+                    await self._init_browser()
+                if not await self.login():
+                    return None
+
+            data = None
+            if self.engine == ENGINE_HTTP:
+                # 로그인이 끝나면 브라우저는 필요 없음
+                await self._close_browser()
+                data = await self.fetch_all_data_http()
+                if data is None:
+                    print("HTTP 엔진 실패, Playwright로 다시 수집...")
+
+            if data is None:
+                if self._browser is None:
+                    await self._init_browser()
+                data = await self.fetch_all_data()
+                self._cookies = await self._page.context.cookies()
+
+            self._save_session()
+            data["marks"] = dict(self.marks)
+            return data
         finally:
             await self._close_browser()
 
+    async def _restore_session(self) -> bool:
+        """저장된 세션이 아직 유효하면 재사용."""
+        self._cookies = self._load_session()
+        if not self._cookies:
+            return False
+
+        if self.engine == ENGINE_HTTP:
+            valid = await self._probe_session_http()
+        else:
+            await self._init_browser()
+            valid = await self._probe_session()
+
+        if not valid:
+            print("저장된 세션 만료, 다시 로그인...")
+            self._cookies = []
+            if self._page:
+                await self._page.context.clear_cookies()
+            return False
+
+        print("저장된 세션 사용")
+        self.stats["session_reused"] = True
+        return True
+
+
+def _digest(value) -> str:
+    """JSON 값의 짧은 해시."""
+    raw = json.dumps(value, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(raw.encode()).hexdigest()[:16]
+
+
+def load_delta_state(path: str | None) -> dict:
+    """마지막으로 전달한 섹션 해시 읽기."""
+    if not path:
+        return {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def save_delta_state(path: str | None, state: dict) -> None:
+    """전달한 섹션 해시 저장."""
+    if not path:
+        return
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(f"{path}.tmp", path)
+
+
+def build_payload(data: dict, state: dict) -> tuple[dict, dict]:
+    """변경된 섹션만 담은 페이로드와 전달 후 저장할 상태 생성.
+
+    이전 상태가 없으면 모든 섹션을 담은 전체 페이로드를 만듭니다.
+    mark 이후만 수집한 섹션(MARKED_SECTIONS)은 새 레코드만 append로 보내고,
+    가장 최근 레코드를 다음 실행의 mark로 저장합니다.
+    """
+    marks = data.get("marks", {})
+    new_marks = {}
+    for section in MARKED_SECTIONS:
+        rows = data[section]
+        mark = record_mark(SECTION_SPECS[section], rows[0]) if rows else marks.get(section)
+        if mark:
+            new_marks[section] = mark
+    # mark 이후만 수집한 섹션은 mark가 바뀌었을 때(새 레코드가 있을 때)만 변경
+    hashes = {
+        section: _digest(
+            new_marks.get(section) if section in MARKED_SECTIONS else data[section]
+        )
+        for section in SECTIONS
+    }
+    version = _digest(hashes)
+    payload = {
+        "timestamp": data["timestamp"],
+        "dong_ho": data["dong_ho"],
+        "version": version,
+    }
+
+    old_hashes = state.get("hashes")
+    if state.get("version") and old_hashes:
+        payload["delta"] = True
+        payload["base_version"] = state["version"]
+        changed = [s for s in SECTIONS if hashes[s] != old_hashes.get(s)]
+    else:
+        changed = list(SECTIONS)
+
+    for section in changed:
+        payload[section] = data[section]
+    append = [section for section in changed if marks.get(section)]
+    if append:
+        payload["append"] = append
+        if not old_hashes:
+            # 전체 재전송인데 새 레코드만 있으면 다음 실행에서 처음부터 다시 수집
+            for section in append:
+                del hashes[section]
+                new_marks.pop(section, None)
+    return payload, {"version": version, "hashes": hashes, "marks": new_marks}
+
+
+def encode_body(payload: dict, encoding: str) -> tuple[bytes, bytes, str]:
+    """페이로드를 JSON으로 직렬화하고 압축.
+
+    (JSON, 전송할 본문, 실제로 사용한 Content-Encoding)을 반환합니다.
+    """
+    raw = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode()
+    body = raw
+    raw_size = len(raw)
+
+    if encoding == "zstd" and zstandard is None:
+        print("zstandard 미설치, gzip 사용")
+        encoding = "gzip"
+    if encoding == "zstd":
+        body = zstandard.ZstdCompressor(level=10).compress(body)
+    elif encoding == "gzip":
+        body = gzip.compress(body, compresslevel=6)
+    else:
+        encoding = "identity"
+
+    if encoding != "identity":
+        print(
+            f"Webhook 본문 압축({encoding}): {raw_size} → {len(body)} bytes "
+            f"({raw_size / max(len(body), 1):.1f}배)"
+        )
+    return raw, body, encoding
+
+
+def sign_body(secret: str, body: bytes) -> dict:
+    """본문(압축 전 JSON)의 HMAC-SHA256 서명 헤더 생성.
+
+    Home Assistant(aiohttp)는 압축을 푼 본문을 넘겨주므로 압축 전 바이트에 서명합니다.
+    """
+    timestamp = str(int(time.time()))
+    nonce = secrets.token_hex(16)
+    message = f"{timestamp}.{nonce}.".encode() + body
+    signature = hmac.new(secret.encode(), message, hashlib.sha256).hexdigest()
+    return {
+        "X-APTi-Timestamp": timestamp,
+        "X-APTi-Nonce": nonce,
+        "X-APTi-Signature": f"sha256={signature}",
+    }
+
+
+class WebhookSender:
+    """Webhook 전송기.
+
+    연결 풀(가능하면 HTTP/2)을 계정 간에 재사용하고,
+    네트워크 오류, 429, 5xx는 지터를 준 지수 백오프로 재시도합니다.
+    """
+
+    BACKOFF_BASE = 1.0
+    BACKOFF_MAX = 30.0
+
+    def __init__(self, encoding: str | None = None, retries: int | None = None):
+        """초기화."""
+        self.encoding = encoding or os.environ.get("APTI_WEBHOOK_ENCODING", "gzip")
+        self.retries = (
+            retries
+            if retries is not None
+            else int(os.environ.get("APTI_WEBHOOK_RETRIES", "4"))
+        )
+        self._client = httpx.AsyncClient(http2=h2 is not None, timeout=30.0)
+        self.requests = 0
+        self.sent_bytes = 0
+
+    async def __aenter__(self) -> "WebhookSender":
+        """컨텍스트 시작."""
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        """컨텍스트 종료 (연결 풀 닫기)."""
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """연결 풀 닫기."""
+        await self._client.aclose()
+
+    def track_task(self) -> None:
+        """현재 작업의 전송량을 따로 집계 (이후 counters는 이 작업의 값 반환).
+
+        여러 계정이 한 sender를 동시에 쓸 때 다른 계정의 전송량이
+        span에 섞이지 않도록 계정 작업마다 호출합니다.
+        """
+        _SEND_COUNTERS.set([0, 0])
+
+    def counters(self) -> tuple:
+        """span 기록용 (요청 수, 전송 바이트)."""
+        task_counters = _SEND_COUNTERS.get()
+        if task_counters is not None:
+            return tuple(task_counters)
+        return self.requests, self.sent_bytes
+
+    @staticmethod
+    def retryable(status: int) -> bool:
+        """재시도하면 성공할 수 있는 응답인지 (전송 오류는 0)."""
+        return status in (0, 408, 429) or status >= 500
+
+    def _delay(self, attempt: int, retry_after: str | None) -> float:
+        """재시도 대기 시간 (Retry-After가 있으면 우선)."""
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), self.BACKOFF_MAX)
+        return random.uniform(0, min(self.BACKOFF_MAX, self.BACKOFF_BASE * 2**attempt))
+
+    async def post(self, webhook_url: str, payload: dict, secret: str | None = None) -> int:
+        """Webhook POST 후 상태 코드 반환 (전송 오류는 0)."""
+        raw, body, encoding = encode_body(payload, self.encoding)
+        base_headers = {"Content-Type": "application/json"}
+        if encoding != "identity":
+            base_headers["Content-Encoding"] = encoding
+
+        status = 0
+        for attempt in range(self.retries + 1):
+            headers = dict(base_headers)
+            if secret:
+                # 재시도마다 새 시각/nonce로 서명
+                headers.update(sign_body(secret, raw))
+
+            retry_after = None
+            self.requests += 1
+            self.sent_bytes += len(body)
+            task_counters = _SEND_COUNTERS.get()
+            if task_counters is not None:
+                task_counters[0] += 1
+                task_counters[1] += len(body)
+            try:
+                response = await self._client.post(webhook_url, content=body, headers=headers)
+                status = response.status_code
+                retry_after = response.headers.get("Retry-After")
+                print(f"Webhook 응답: {status} ({response.http_version})")
+            except httpx.HTTPError as e:
+                status = 0
+                print(f"Webhook 전송 오류: {e}")
+
+            if status in (400, 415) and encoding == "zstd":
+                # Home Assistant(aiohttp)에 zstd 지원이 없으면 이후 요청은 gzip으로
+                print("Home Assistant가 zstd 본문을 풀지 못함, gzip으로 다시 전송")
+                self.encoding = "gzip"
+                return await self.post(webhook_url, payload, secret)
+            if not self.retryable(status) or attempt == self.retries:
+                return status
+            delay = self._delay(attempt, retry_after)
+            print(f"Webhook 재시도 {attempt + 1}/{self.retries} ({delay:.1f}초 후)")
+            await asyncio.sleep(delay)
+        return status
+
+
+def load_outbox(path: str | None) -> dict | None:
+    """전달하지 못한 페이로드 읽기."""
+    if not path:
+        return None
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def save_outbox(path: str, entry: dict) -> None:
+    """전달하지 못한 페이로드 저장 (같은 계정의 이전 항목은 대체)."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+        json.dump(entry, f, ensure_ascii=False)
+    os.replace(f"{path}.tmp", path)
+
+
+def clear_outbox(path: str | None) -> None:
+    """outbox 비우기."""
+    if path and os.path.exists(path):
+        os.remove(path)
+
+
+async def drain_outbox(
+    sender: WebhookSender,
+    outbox_path: str | None,
+    state_path: str | None,
+    secret: str | None = None,
+) -> bool:
+    """지난 실행에서 전달하지 못한 페이로드를 먼저 전송.
+
+    전달되면 함께 저장해 둔 섹션 해시를 반영합니다.
+    Home Assistant가 다시 받을 수 없는 응답(409 등)이면 항목을 버립니다.
+    """
+    entry = load_outbox(outbox_path)
+    if entry is None:
+        return True
+
+    print(f"미전송 데이터 재전송 ({entry.get('created', '')})")
+    if secret is None:
+        secret = os.environ.get("HA_WEBHOOK_SECRET") or None
+    status = await sender.post(entry["webhook_url"], entry["payload"], secret)
+    if status in (200, 202):
+        save_delta_state(state_path, entry["state"])
+        clear_outbox(outbox_path)
+        return True
+    if not sender.retryable(status):
+        print(f"미전송 데이터 폐기 (응답 {status})")
+        clear_outbox(outbox_path)
+        return True
+    return False
+
+
+async def send_to_webhook(
+    webhook_url: str,
+    data: dict,
+    state_path: str | None = None,
+    secret: str | None = None,
+    sender: WebhookSender | None = None,
+    outbox_path: str | None = None,
+) -> str:
+    """Home Assistant Webhook으로 전송하고 결과(SEND_*) 반환.
+
+    state_path를 지정하면 지난 전송 이후 바뀐 섹션만 보냅니다.
+    Home Assistant가 기준 버전을 모르면(409) 전체 데이터를 다시 보냅니다.
+    secret을 지정하면 요청마다 서명 헤더를 붙입니다.
+    재시도해도 전달하지 못하면 outbox_path에 저장해 다음 실행 때 먼저 보냅니다.
+    """
+    if sender is None:
+        async with WebhookSender() as sender:
+            return await send_to_webhook(
+                webhook_url, data, state_path, secret, sender, outbox_path
+            )
 
-async def send_to_webhook(webhook_url: str, data: dict) -> bool:
-    """Home Assistant Webhook으로 전송."""
     print(f"Webhook 전송: {webhook_url}")
+    if secret is None:
+        secret = os.environ.get("HA_WEBHOOK_SECRET") or None
 
-    async with httpx.AsyncClient() as client:
+    payload, new_state = build_payload(data, load_delta_state(state_path))
+    if payload.get("delta"):
+        changed = [section for section in SECTIONS if section in payload]
+        print(f"변경된 섹션: {', '.join(changed) if changed else '없음'}")
+
+    status = await sender.post(webhook_url, payload, secret)
+    if status == 409 and payload.get("delta"):
+        print("기준 버전 불일치, 전체 데이터 재전송...")
+        payload, new_state = build_payload(data, {})
+        status = await sender.post(webhook_url, payload, secret)
+
+    # 202: Home Assistant가 접수 후 순서대로 처리
+    if status in (200, 202):
+        save_delta_state(state_path, new_state)
+        # 마지막 전달 상태 기준으로 만든 페이로드이므로 미전송 항목은 필요 없음
+        clear_outbox(outbox_path)
+        return SEND_OK
+
+    if outbox_path and sender.retryable(status):
+        save_outbox(outbox_path, {
+            "created": data["timestamp"],
+            "webhook_url": webhook_url,
+            "payload": payload,
+            "state": new_state,
+        })
+        print(f"Webhook 전달 실패, 다음 실행 때 재전송: {outbox_path}")
+        return SEND_QUEUED
+    return SEND_FAILED
+
+
+def parser_options() -> dict:
+    """환경 변수에서 파서 옵션 읽기."""
+    return {
+        "concurrency": int(os.environ.get("APTI_CONCURRENCY", "1")),
+        "engine": os.environ.get("APTI_ENGINE", ENGINE_PLAYWRIGHT),
+        "state_dir": os.environ.get("APTI_STATE_DIR", ".apti") or None,
+        "block_resources": os.environ.get("APTI_BLOCK_RESOURCES", "1") != "0",
+        "record_dir": os.environ.get("APTI_RECORD_DIR") or None,
+    }
+
+
+def print_summary(parser: APTiParser, data: dict) -> None:
+    """파싱 결과 요약 출력."""
+    print("\n=== 파싱 결과 ===")
+    print(f"동호: {data['dong_ho']}")
+    print(f"관리비 항목: {len(data['maint_items'])}개")
+    print(f"납부액: {data['maint_payment'].get('amount', 'N/A')}원")
+    print(f"에너지: {len(data['energy_category'])}개")
+    new_only = " (지난 전송 이후)" if data.get("marks", {}).get("payment_history") else ""
+    print(f"납부내역: {len(data['payment_history'])}건{new_only}")
+    print(f"세션 재사용: {'예' if parser.stats['session_reused'] else '아니오'}")
+    blocked = parser.stats["blocked_requests"]
+    blocked_detail = ", ".join(f"{kind} {count}" for kind, count in blocked.items())
+    print(
+        f"요청: {parser.stats['requests']}건 "
+        f"({parser.stats['transferred_bytes'] / 1024:.1f}KB), "
+        f"차단: {sum(blocked.values())}건"
+        + (f" ({blocked_detail})" if blocked_detail else "")
+    )
+    print(
+        f"페이지 로드: {parser.stats['page_loads']}회, "
+        f"캐시 재사용: {parser.stats['page_cache_hits']}회"
+    )
+    for label, seconds in parser.stats["wait_times"].items():
+        print(f"대기 시간 {label}: {seconds:.2f}초")
+    for key, seconds in parser.stats["fetch_times"].items():
+        print(f"수집 시간 {key}: {seconds:.2f}초")
+
+
+def load_accounts(path: str) -> list[dict]:
+    """계정 목록 파일 읽기 (JSON 또는 YAML).
+
+    각 계정은 user_id, password(또는 password_env), webhook_url을 가집니다.
+    webhook_secret(또는 webhook_secret_env)은 선택입니다.
+    """
+    with open(path, encoding="utf-8") as f:
+        if path.endswith((".yaml", ".yml")):
+            try:
+                import yaml
+            except ImportError:
+                print("오류: YAML 계정 파일을 읽으려면 pyyaml 패키지 필요 (pip install pyyaml)")
+                sys.exit(1)
+
+            loaded = yaml.safe_load(f)
+        else:
+            loaded = json.load(f)
+
+    if isinstance(loaded, dict):
+        loaded = loaded.get("accounts", [])
+
+    accounts = []
+    for entry in loaded:
+        password = entry.get("password") or os.environ.get(entry.get("password_env", ""), "")
+        if not entry.get("user_id") or not password or not entry.get("webhook_url"):
+            raise ValueError(f"계정 설정 누락: {entry.get('name') or entry.get('user_id')}")
+        accounts.append({
+            "name": entry.get("name") or entry["user_id"],
+            "user_id": entry["user_id"],
+            "password": password,
+            "webhook_url": entry["webhook_url"],
+            "webhook_secret": entry.get("webhook_secret")
+            or os.environ.get(entry.get("webhook_secret_env", ""))
+            or None,
+        })
+    return accounts
+
+
+async def run_batch(accounts: list[dict], workers: int, options: dict) -> list[dict]:
+    """여러 계정을 브라우저 하나로 수집.
+
+    계정마다 별도 컨텍스트를 쓰고, 최대 workers개 계정을 동시에 처리합니다.
+    """
+    semaphore = asyncio.Semaphore(max(1, workers))
+    recorders = []
+
+    async def run_account(browser, sender: WebhookSender, index: int, account: dict) -> dict:
+        async with semaphore:
+            start = time.monotonic()
+            result = {"name": account["name"], "success": False, "error": ""}
+            # gather가 계정마다 별도 작업으로 실행하므로 전송량도 계정별로 집계
+            sender.track_task()
+            try:
+                parser = APTiParser(
+                    account["user_id"], account["password"], browser=browser, **options
+                )
+                parser.spans = SpanRecorder(pid=index + 1, label=account["name"])
+                recorders.append(parser.spans)
+                state_path = parser.state_file("delta", "json")
+                outbox_path = parser.state_file("outbox", "json")
+                with parser.spans.span("drain_outbox", "send", sender.counters):
+                    await drain_outbox(
+                        sender, outbox_path, state_path, account["webhook_secret"]
+                    )
+                parser.marks = load_delta_state(state_path).get("marks", {})
+
+                data = await parser.run()
+                if data is None:
+                    result["error"] = "파싱 실패"
+                else:
+                    with parser.spans.span("send_to_webhook", "send", sender.counters):
+                        status = await send_to_webhook(
+                            account["webhook_url"],
+                            data,
+                            state_path,
+                            secret=account["webhook_secret"],
+                            sender=sender,
+                            outbox_path=outbox_path,
+                        )
+                    result["success"] = status != SEND_FAILED
+                    if status == SEND_QUEUED:
+                        result["error"] = "전달 실패, 다음 실행 때 재전송"
+                    elif status == SEND_FAILED:
+                        result["error"] = "Webhook 전송 실패"
+            except Exception as e:
+                result["error"] = str(e)
+            result["seconds"] = time.monotonic() - start
+            return result
+
+    async with async_playwright() as playwright, WebhookSender() as sender:
+        browser = await playwright.chromium.launch(headless=True)
         try:
-            response = await client.post(
-                webhook_url,
-                json=data,
-                headers={"Content-Type": "application/json"},
-                timeout=30.0,
+            results = await asyncio.gather(
+                *(
+                    run_account(browser, sender, index, account)
+                    for index, account in enumerate(accounts)
+                )
             )
-            print(f"Webhook 응답: {response.status_code}")
-            return response.status_code == 200
-        except Exception as e:
-            print(f"Webhook 전송 오류: {e}")
-            return False
+        finally:
+            await browser.close()
+
+    print("\n=== 배치 결과 ===")
+    print(f"{'계정':<20} {'결과':<6} {'시간':>8}  오류")
+    for result in results:
+        status = "성공" if result["success"] else "실패"
+        print(
+            f"{result['name']:<20} {status:<6} {result['seconds']:>7.2f}s  {result['error']}"
+        )
+    for recorder in recorders:
+        print(recorder.summary())
+    trace_path = os.environ.get("APTI_TRACE_FILE")
+    if trace_path:
+        write_trace(trace_path, recorders)
+    return results
 
 
 async def main():
     """메인."""
     # 환경 변수에서 설정 읽기
+    accounts_file = os.environ.get("APTI_ACCOUNTS_FILE")
+    if accounts_file:
+        accounts = load_accounts(accounts_file)
+        workers = int(os.environ.get("APTI_BATCH_WORKERS", "4"))
+        results = await run_batch(accounts, workers, parser_options())
+        if not all(result["success"] for result in results):
+            sys.exit(1)
+        return
+
     user_id = os.environ.get("APTI_USER_ID")
     password = os.environ.get("APTI_PASSWORD")
     webhook_url = os.environ.get("HA_WEBHOOK_URL")
@@ -396,26 +1598,46 @@ async def main():
         print("오류: HA_WEBHOOK_URL 환경 변수 필요")
         sys.exit(1)
 
-    parser = APTiParser(user_id, password)
-    data = await parser.run()
+    parser = APTiParser(user_id, password, **parser_options())
+    state_path = parser.state_file("delta", "json")
+    outbox_path = parser.state_file("outbox", "json")
 
-    if data:
-        print(f"\n=== 파싱 결과 ===")
-        print(f"동호: {data['dong_ho']}")
-        print(f"관리비 항목: {len(data['maint_items'])}개")
-        print(f"납부액: {data['maint_payment'].get('amount', 'N/A')}원")
-        print(f"에너지: {len(data['energy_category'])}개")
-        print(f"납부내역: {len(data['payment_history'])}건")
+    trace_path = os.environ.get("APTI_TRACE_FILE")
 
-        # Webhook 전송
-        success = await send_to_webhook(webhook_url, data)
-        if success:
-            print("\nWebhook 전송 성공!")
-        else:
-            print("\nWebhook 전송 실패!")
+    async with WebhookSender() as sender:
+        # 지난 실행에서 전달하지 못한 데이터 먼저 전송
+        with parser.spans.span("drain_outbox", "send", sender.counters):
+            await drain_outbox(sender, outbox_path, state_path)
+
+        # 지난번 전달한 마지막 납부내역 앞까지만 수집
+        parser.marks = load_delta_state(state_path).get("marks", {})
+        data = await parser.run()
+        if not data:
+            print(parser.spans.summary())
+            if trace_path:
+                write_trace(trace_path, [parser.spans])
+            print("파싱 실패!")
             sys.exit(1)
+
+        print_summary(parser, data)
+
+        # Webhook 전송
+        with parser.spans.span("send_to_webhook", "send", sender.counters):
+            status = await send_to_webhook(
+                webhook_url, data, state_path, sender=sender, outbox_path=outbox_path
+            )
+
+    print(parser.spans.summary())
+    if trace_path:
+        write_trace(trace_path, [parser.spans])
+
+    if status == SEND_OK:
+        print("\nWebhook 전송 성공!")
+    elif status == SEND_QUEUED:
+        # 실패로 끝나면 actions/cache가 outbox를 저장하지 않으므로 정상 종료
+        print("\nWebhook 전달 실패, 다음 실행 때 재전송합니다.")
     else:
-        print("파싱 실패!")
+        print("\nWebhook 전송 실패!")
         sys.exit(1)
 
 
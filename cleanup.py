@@ -21,7 +21,11 @@ KEEP_FILES = {
     "entity.py",
     "sensor.py",
     "apti_parser.py",
+    "apti_bench.py",
     "helper.py",
+    "diagnostics.py",
+    "history.py",
+    "schema.py",
 
     # 설정 파일
     "manifest.json",
@@ -44,6 +48,7 @@ KEEP_DIRS = {
     ".github",
     "translations",
     "icons",
+    "tests",
 }
 
 # 삭제할 파일 패턴
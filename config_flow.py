@@ -6,7 +6,8 @@ from typing import Any
 
 import voluptuous as vol
 
-from homeassistant.config_entries import ConfigFlow
+from homeassistant.config_entries import ConfigEntry, ConfigFlow, OptionsFlow
+from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers.network import get_url
 import homeassistant.helpers.config_validation as cv
@@ -15,8 +16,10 @@ from .const import (
     DOMAIN,
     LOGGER,
     CONF_WEBHOOK_ID,
+    CONF_WEBHOOK_SECRET,
     CONF_APT_NAME,
 )
+from .helper import webhook_secret
 
 
 class APTiConfigFlow(ConfigFlow, domain=DOMAIN):
@@ -51,6 +54,8 @@ class APTiConfigFlow(ConfigFlow, domain=DOMAIN):
                 data={
                     CONF_WEBHOOK_ID: self._webhook_id,
                     CONF_APT_NAME: apt_name,
+                    # 설정하면 서명된 요청만 받음 (파서의 HA_WEBHOOK_SECRET과 같은 값)
+                    CONF_WEBHOOK_SECRET: user_input.get(CONF_WEBHOOK_SECRET, ""),
                 },
             )
 
@@ -59,6 +64,7 @@ class APTiConfigFlow(ConfigFlow, domain=DOMAIN):
             data_schema=vol.Schema(
                 {
                     vol.Optional(CONF_APT_NAME, default="우리 아파트"): cv.string,
+                    vol.Optional(CONF_WEBHOOK_SECRET, default=""): cv.string,
                 }
             ),
             errors=errors,
@@ -70,3 +76,36 @@ class APTiConfigFlow(ConfigFlow, domain=DOMAIN):
     async def async_step_import(self, import_data: dict) -> FlowResult:
         """Handle import from configuration.yaml."""
         return await self.async_step_user(import_data)
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> APTiOptionsFlow:
+        """Get the options flow."""
+        return APTiOptionsFlow()
+
+
+class APTiOptionsFlow(OptionsFlow):
+    """Handle APT.i options (Webhook 비밀키 추가/변경)."""
+
+    async def async_step_init(
+        self,
+        user_input: dict[str, Any] | None = None,
+    ) -> FlowResult:
+        """Manage the options."""
+        if user_input is not None:
+            # 비우면 서명 확인 안 함 (파서의 HA_WEBHOOK_SECRET도 함께 변경)
+            return self.async_create_entry(
+                data={CONF_WEBHOOK_SECRET: user_input.get(CONF_WEBHOOK_SECRET, "")}
+            )
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        CONF_WEBHOOK_SECRET,
+                        default=webhook_secret(self.config_entry) or "",
+                    ): cv.string,
+                }
+            ),
+        )
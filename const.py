@@ -31,10 +31,45 @@ CONF_PASSWORD = "password"
 CONF_SCAN_INTERVAL = "scan_interval"
 CONF_APT_NAME = "apt_name"
 CONF_WEBHOOK_ID = "webhook_id"
+CONF_WEBHOOK_SECRET = "webhook_secret"
 
 # 데이터 키
 DATA_COORDINATOR = "coordinator"
 DATA_API = "api"
+DATA_ROUTES = "routes"
+
+# Webhook 본문 최대 크기 (압축 해제 후)
+MAX_WEBHOOK_PAYLOAD = 4 * 1024 * 1024
+
+# Webhook 페이로드 섹션 (부분 전송 시 바뀐 섹션만 포함)
+PAYLOAD_SECTIONS = (
+    "maint_items",
+    "maint_payment",
+    "energy_category",
+    "energy_type",
+    "payment_history",
+)
+
+# Webhook 서명 (공유 비밀키 설정 시 필수)
+HEADER_SIGNATURE = "X-APTi-Signature"
+HEADER_TIMESTAMP = "X-APTi-Timestamp"
+HEADER_NONCE = "X-APTi-Nonce"
+SIGNATURE_MAX_SKEW = 300  # 초, 전송 시각과의 최대 차이
+NONCE_CACHE_SIZE = 256  # 재전송 확인용으로 기억할 nonce 수
+
+# 엔트리별로 처리 대기 중인 Webhook 페이로드 최대 수 (넘으면 429)
+WEBHOOK_QUEUE_SIZE = 4
+# 대기 중인 페이로드 하나에 합치는 최대 수 (넘으면 새로 대기)
+WEBHOOK_COALESCE_LIMIT = 4
+
+# 마지막 수신 데이터 스냅샷 (재시작 시 복원)
+SNAPSHOT_STORAGE_VERSION = 1
+SNAPSHOT_SAVE_DELAY = 10  # 초, 연속 수신 시 저장을 묶음
+# 수집 시각이 이보다 오래되면 오래된 데이터로 표시 (GitHub Actions는 하루 1회)
+STALE_DATA_AGE = timedelta(hours=48)
+
+# 항목이 이 횟수만큼 연속으로 업데이트에서 빠지면 해당 센서 제거
+STALE_ENTITY_UPDATES = 3
 
 # 센서 타입
 SENSOR_TYPE_MAINT_TOTAL = "maint_total"
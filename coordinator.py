@@ -1,18 +1,58 @@
 """DataUpdateCoordinator for APT.i integration."""
 from __future__ import annotations
 
-from homeassistant.core import HomeAssistant
+import asyncio
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.helpers.event import async_track_point_in_time
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.util import dt as dt_util
 
-from .api import APTiAPI, APTiData
+from .api import (
+    UPDATE_KEY_ANY,
+    APTiAPI,
+    APTiData,
+    APTiVersionMismatch,
+    ValidatedPayload,
+    merge_payloads,
+    update_key,
+    validate_payload,
+)
+from .helper import InvalidPayload
+from .history import (
+    HISTORY_SECTIONS,
+    APTiHistory,
+    async_import_statistics,
+    history_path,
+    history_rows,
+    payment_rows,
+)
 from .const import (
     DOMAIN,
     LOGGER,
     CONF_WEBHOOK_ID,
+    SNAPSHOT_SAVE_DELAY,
+    SNAPSHOT_STORAGE_VERSION,
+    STALE_DATA_AGE,
+    WEBHOOK_COALESCE_LIMIT,
+    WEBHOOK_QUEUE_SIZE,
 )
 
 
+class APTiQueueFull(Exception):
+    """처리 대기 중인 Webhook 페이로드가 너무 많음."""
+
+
+def snapshot_store(hass: HomeAssistant, entry_id: str) -> Store[dict]:
+    """엔트리별 스냅샷 저장소."""
+    return Store(hass, SNAPSHOT_STORAGE_VERSION, f"{DOMAIN}.{entry_id}")
+
+
 class APTiDataUpdateCoordinator(DataUpdateCoordinator[APTiData]):
     """APT.i Data Update Coordinator.
 
@@ -41,16 +81,284 @@ class APTiDataUpdateCoordinator(DataUpdateCoordinator[APTiData]):
             webhook_id=entry.data[CONF_WEBHOOK_ID],
         )
 
+        # 데이터 리비전 및 센서 캐시 통계 (진단용)
+        self._revision = 0
+        self.cache_stats = {"hits": 0, "misses": 0}
+
+        # 알림 키 → 해당 데이터를 쓰는 엔티티 콜백
+        self._key_listeners: dict[str, set[CALLBACK_TYPE]] = {}
+
+        # 마지막 수신 데이터 스냅샷 (재시작 시 복원)
+        self._store = snapshot_store(hass, entry.entry_id)
+        self.restored = False
+        # 데이터가 오래되는 시각에 센서 상태를 다시 쓰는 타이머
+        self._unsub_stale: CALLBACK_TYPE | None = None
+        entry.async_on_unload(self._async_cancel_stale_check)
+
+        # 처리 대기 중인 Webhook 페이로드 (같은 세대의 연속 수신은 하나로 합침)
+        self._pending: deque[dict] = deque()
+        # 마지막 대기 페이로드에 합친 페이로드 수
+        self._tail_merges = 0
+        self._pending_event = asyncio.Event()
+        # 검증 중인 페이로드 (다음 부분 페이로드의 기준 버전)
+        self._inflight: dict | None = None
+        self.ingest_stats = {"accepted": 0, "coalesced": 0, "rejected": 0}
+        # 마지막 검증 결과 (격리한 섹션 사유, 섹션별 처리 시간) 및 누적 격리 수
+        self.validation: dict[str, Any] = {}
+        self.quarantine_count = 0
+
+        # 월별 요금 이력 (장기 통계 원본)
+        self.history = APTiHistory(history_path(hass, entry.entry_id))
+
         LOGGER.info("APT.i Coordinator 초기화 (Webhook 방식)")
 
     async def _async_update_data(self) -> APTiData:
         """데이터 업데이트 (Webhook으로 이미 수신된 데이터 반환)."""
         return self.api.data
 
-    def handle_webhook(self, payload: dict) -> None:
-        """Webhook 데이터 처리."""
-        self.api.update_from_webhook(payload)
-        self.async_set_updated_data(self.api.data)
+    async def async_restore_snapshot(self) -> None:
+        """저장된 스냅샷으로 데이터 복원 (플랫폼 설정 전에 호출)."""
+        snapshot = await self._store.async_load()
+        if not snapshot:
+            return
+
+        try:
+            self.api.update_from_webhook(snapshot)
+        except Exception as err:
+            LOGGER.warning("저장된 데이터 복원 실패: %s", err)
+            return
+
+        self._revision += 1
+        self.api.data.revision = self._revision
+        self.data = self.api.data
+        self.last_update_success = True
+        self.restored = True
+        self._async_schedule_stale_check()
+
+        LOGGER.info(
+            "저장된 데이터 복원 - 수집 시각: %s%s",
+            self.api.data.last_update,
+            " (오래된 데이터)" if self.is_stale else "",
+        )
+
+    async def _async_record_history(self) -> None:
+        """현재 데이터를 월별 이력에 기록하고 장기 통계 갱신."""
+        # 행은 이벤트 루프에서 만들어 두고 DB 쓰기만 executor에서 수행
+        rows = history_rows(self.api.data)
+        payments = payment_rows(self.api.data)
+        try:
+            changed = await self.hass.async_add_executor_job(
+                self.history.record, rows, payments
+            )
+            await async_import_statistics(
+                self.hass, self.history, self.entry.entry_id, changed
+            )
+        except Exception as err:
+            LOGGER.warning("이력 기록 실패: %s", err)
+
+    @callback
+    def _snapshot_data(self) -> dict:
+        """저장할 스냅샷."""
+        return self.api.snapshot()
+
+    @property
+    def collected_at(self) -> datetime | None:
+        """마지막 데이터 수집 시각."""
+        if not self.data or not self.data.last_update:
+            return None
+        collected = dt_util.parse_datetime(self.data.last_update)
+        if collected is not None and collected.tzinfo is None:
+            # 파서는 로컬 시각으로 기록
+            collected = collected.replace(tzinfo=dt_util.get_default_time_zone())
+        return collected
+
+    @property
+    def data_age(self) -> timedelta | None:
+        """마지막 데이터 수집 후 경과 시간."""
+        collected = self.collected_at
+        if collected is None:
+            return None
+        return dt_util.utcnow() - collected
+
+    @property
+    def is_stale(self) -> bool:
+        """데이터가 오래되었는지 여부."""
+        age = self.data_age
+        return age is not None and age > STALE_DATA_AGE
+
+    @callback
+    def _async_schedule_stale_check(self) -> None:
+        """데이터가 오래되는 시각에 센서 상태를 다시 쓰도록 예약."""
+        self._async_cancel_stale_check()
+        collected = self.collected_at
+        if collected is None:
+            return
+        stale_at = collected + STALE_DATA_AGE
+        if stale_at <= dt_util.utcnow():
+            return
+        self._unsub_stale = async_track_point_in_time(
+            self.hass, self._async_mark_stale, stale_at
+        )
+
+    @callback
+    def _async_cancel_stale_check(self) -> None:
+        """예약한 타이머 취소."""
+        if self._unsub_stale is not None:
+            self._unsub_stale()
+            self._unsub_stale = None
+
+    @callback
+    def _async_mark_stale(self, _now: datetime) -> None:
+        """새 데이터 없이 STALE_DATA_AGE가 지나면 "오래된 데이터" 속성 반영."""
+        self._unsub_stale = None
+        LOGGER.warning("%s 동안 새 데이터 없음", STALE_DATA_AGE)
+        self.async_update_listeners()
+
+    @callback
+    def async_add_key_listener(
+        self, keys: tuple[str, ...], update_callback: CALLBACK_TYPE
+    ) -> CALLBACK_TYPE:
+        """알림 키에 해당하는 데이터가 바뀔 때만 호출할 콜백 등록."""
+        for key in keys:
+            self._key_listeners.setdefault(key, set()).add(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            for key in keys:
+                listeners = self._key_listeners.get(key)
+                if listeners is not None:
+                    listeners.discard(update_callback)
+                    if not listeners:
+                        del self._key_listeners[key]
+
+        return remove_listener
+
+    @callback
+    def async_enqueue_webhook(self, payload: dict) -> None:
+        """Webhook 페이로드를 처리 대기열에 추가.
+
+        부분 페이로드의 기준 버전은 대기열 처리 후 버전과 바로 비교합니다.
+        """
+        if not isinstance(payload, dict):
+            raise InvalidPayload("JSON 객체가 아님")
+
+        tail = self._pending[-1] if self._pending else None
+        if tail is not None:
+            expected = tail.get("version", "")
+        elif self._inflight is not None:
+            expected = self._inflight.get("version", "")
+        else:
+            expected = self.api.data.version
+        if payload.get("delta") and payload.get("base_version") != expected:
+            self.ingest_stats["rejected"] += 1
+            raise APTiVersionMismatch(
+                f"기준 버전 불일치: {payload.get('base_version')} != {expected}"
+            )
+
+        if (
+            tail is not None
+            and tail.get("dong_ho") == payload.get("dong_ho")
+            and self._tail_merges < WEBHOOK_COALESCE_LIMIT
+        ):
+            # 아직 처리하지 않은 같은 세대 데이터는 최신 내용으로 합침
+            self._pending[-1] = merge_payloads(tail, payload)
+            self._tail_merges += 1
+            self.ingest_stats["coalesced"] += 1
+            return
+
+        if len(self._pending) >= WEBHOOK_QUEUE_SIZE:
+            self.ingest_stats["rejected"] += 1
+            raise APTiQueueFull(f"처리 대기 중인 데이터 {len(self._pending)}건")
+
+        self._pending.append(payload)
+        self._tail_merges = 0
+        self.ingest_stats["accepted"] += 1
+        self._pending_event.set()
+
+    async def async_process_webhooks(self) -> None:
+        """대기열의 Webhook 페이로드를 순서대로 처리 (엔트리 백그라운드 작업)."""
+        while True:
+            await self._pending_event.wait()
+            self._pending_event.clear()
+            while self._pending:
+                payload = self._inflight = self._pending.popleft()
+                try:
+                    # 검증과 레코드 변환은 executor에서 수행
+                    validated = await self.hass.async_add_executor_job(
+                        validate_payload, payload
+                    )
+                    self.handle_webhook(validated)
+                except APTiVersionMismatch as err:
+                    LOGGER.warning("부분 데이터 적용 실패: %s", err)
+                    self._async_invalidate_version()
+                except Exception as err:
+                    LOGGER.error("Webhook 처리 오류: %s", err)
+                    self._async_invalidate_version()
+                finally:
+                    self._inflight = None
+
+    @callback
+    def _async_invalidate_version(self) -> None:
+        """데이터 버전을 비워 다음 부분 전송에 409 응답 (파서가 전체 데이터를 다시 보냄).
+
+        202로 접수한 페이로드를 적용하지 못하면 파서는 전달된 것으로 알고 있으므로 필요합니다.
+        """
+        self.api.data.version = ""
+
+    def handle_webhook(self, validated: ValidatedPayload) -> None:
+        """검증한 Webhook 데이터 처리.
+
+        바뀐 섹션/항목을 쓰는 엔티티에만 알리고, 바뀐 데이터가 없으면 갱신을 생략합니다.
+        """
+        self.validation = {
+            "quarantined": dict(validated.quarantined),
+            "timings_ms": {
+                section: round(elapsed, 3)
+                for section, elapsed in validated.timings.items()
+            },
+        }
+        if validated.quarantined:
+            self.quarantine_count += len(validated.quarantined)
+            for section, reason in validated.quarantined.items():
+                LOGGER.warning("잘못된 데이터 무시 (%s): %s", section, reason)
+
+        was_stale = self.is_stale
+        changed = self.api.apply_payload(validated)
+        # 내용이 같아도 수집 시각은 갱신되므로 스냅샷은 항상 저장
+        self.restored = False
+        self._store.async_delay_save(self._snapshot_data, SNAPSHOT_SAVE_DELAY)
+        self._async_schedule_stale_check()
+        if not changed and self.data is not None:
+            if was_stale and not self.is_stale:
+                # "오래된 데이터" 속성 제거
+                self.async_update_listeners()
+            return
+
+        self._revision += 1
+        self.api.data.revision = self._revision
+
+        if self.data is None or any(
+            update_key(section) in changed
+            for section in (*HISTORY_SECTIONS, "payment_history")
+        ):
+            self.hass.async_create_background_task(
+                self._async_record_history(), f"{DOMAIN} history"
+            )
+
+        callbacks = set(self._key_listeners.get(UPDATE_KEY_ANY, ()))
+
+        # 첫 수신이나 동호 변경은 모든 엔티티에 영향
+        if self.data is None or update_key("dong_ho") in changed:
+            self.async_set_updated_data(self.api.data)
+        else:
+            self.data = self.api.data
+            self.last_update_success = True
+            for key in changed:
+                callbacks.update(self._key_listeners.get(key, ()))
+
+        LOGGER.debug("변경 알림: %d개 키, %d개 엔티티", len(changed), len(callbacks))
+        for update_callback in callbacks:
+            update_callback()
 
     @property
     def dong_ho(self) -> str:
@@ -0,0 +1,40 @@
+"""Diagnostics support for APT.i."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_WEBHOOK_ID, DATA_ROUTES, DOMAIN
+from .coordinator import APTiDataUpdateCoordinator
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: APTiDataUpdateCoordinator = entry.runtime_data
+    data = coordinator.data
+    route = hass.data.get(DOMAIN, {}).get(DATA_ROUTES, {}).get(
+        entry.data[CONF_WEBHOOK_ID]
+    )
+
+    return {
+        "revision": data.revision if data else None,
+        "version": data.version if data else None,
+        "last_update": data.last_update if data else None,
+        "restored": coordinator.restored,
+        "stale": coordinator.is_stale,
+        "maint_items": len(data.maint_items) if data else 0,
+        "energy_category": len(data.energy_category) if data else 0,
+        "energy_type": len(data.energy_type) if data else 0,
+        "payment_history": len(data.payment_history) if data else 0,
+        "sensor_cache": dict(coordinator.cache_stats),
+        "webhook_queue": dict(coordinator.ingest_stats),
+        "validation": coordinator.validation,
+        "quarantined_total": coordinator.quarantine_count,
+        "webhook_requests": route.requests if route else 0,
+        "webhook_responses": dict(route.responses) if route else {},
+    }
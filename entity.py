@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable
+from typing import Any
+
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
@@ -14,6 +17,9 @@ class APTiEntity(CoordinatorEntity[APTiDataUpdateCoordinator]):
 
     _attr_has_entity_name = True
 
+    # 이 엔티티가 읽는 데이터의 알림 키 (비어 있으면 전체 갱신 때만 업데이트)
+    _listen_keys: tuple[str, ...] = ()
+
     def __init__(
         self,
         coordinator: APTiDataUpdateCoordinator,
@@ -22,6 +28,32 @@ class APTiEntity(CoordinatorEntity[APTiDataUpdateCoordinator]):
         """Initialize the entity."""
         super().__init__(coordinator)
         self._device_name = device_name
+        # 이름 → (데이터 리비전, 계산 결과)
+        self._memo: dict[str, tuple[int, Any]] = {}
+
+    async def async_added_to_hass(self) -> None:
+        """When entity is added to hass."""
+        await super().async_added_to_hass()
+        if self._listen_keys:
+            self.async_on_remove(
+                self.coordinator.async_add_key_listener(
+                    self._listen_keys, self._handle_coordinator_update
+                )
+            )
+
+    def _memoize(self, name: str, compute: Callable[[], Any]) -> Any:
+        """데이터 리비전이 바뀔 때만 다시 계산."""
+        data = self.coordinator.data
+        revision = data.revision if data else -1
+        cached = self._memo.get(name)
+        if cached is not None and cached[0] == revision:
+            self.coordinator.cache_stats["hits"] += 1
+            return cached[1]
+
+        self.coordinator.cache_stats["misses"] += 1
+        value = compute()
+        self._memo[name] = (revision, value)
+        return value
 
     @property
     def device_info(self) -> DeviceInfo:
@@ -2,10 +2,111 @@
 
 from __future__ import annotations
 
+from collections import OrderedDict
+from collections.abc import Callable
+import hashlib
+import hmac
+import json
 import re
+import time
 from typing import Any
 
-from .const import LOGGER
+from aiohttp import hdrs, web
+
+from homeassistant.config_entries import ConfigEntry
+
+from .const import (
+    LOGGER,
+    CONF_WEBHOOK_SECRET,
+    HEADER_NONCE,
+    HEADER_SIGNATURE,
+    HEADER_TIMESTAMP,
+    NONCE_CACHE_SIZE,
+    SIGNATURE_MAX_SKEW,
+)
+
+
+class InvalidPayload(ValueError):
+    """Webhook 본문을 해석할 수 없음."""
+
+
+class PayloadTooLarge(InvalidPayload):
+    """Webhook 본문이 최대 크기를 넘음."""
+
+
+class UnsupportedEncoding(InvalidPayload):
+    """지원하지 않는 Content-Encoding."""
+
+
+class InvalidSignature(Exception):
+    """Webhook 서명이 없거나 맞지 않음 (또는 재전송된 요청)."""
+
+
+class NonceCache:
+    """최근 사용한 nonce (개수 제한 LRU)."""
+
+    def __init__(self, max_size: int = NONCE_CACHE_SIZE) -> None:
+        """초기화."""
+        self._max_size = max_size
+        self._nonces: OrderedDict[str, None] = OrderedDict()
+
+    def __contains__(self, nonce: str) -> bool:
+        """이미 사용한 nonce인지 여부."""
+        return nonce in self._nonces
+
+    def add(self, nonce: str) -> None:
+        """nonce 기록 (가장 오래된 것부터 제거)."""
+        self._nonces[nonce] = None
+        self._nonces.move_to_end(nonce)
+        while len(self._nonces) > self._max_size:
+            self._nonces.popitem(last=False)
+
+
+def webhook_secret(entry: ConfigEntry) -> str | None:
+    """엔트리의 Webhook 비밀키 (옵션에서 바꾼 값 우선, 비어 있으면 서명 확인 안 함)."""
+    if CONF_WEBHOOK_SECRET in entry.options:
+        return entry.options[CONF_WEBHOOK_SECRET] or None
+    return entry.data.get(CONF_WEBHOOK_SECRET) or None
+
+
+def check_signature_headers(
+    headers: Any, nonces: NonceCache, now: float | None = None
+) -> tuple[str, str, str]:
+    """서명 헤더 확인 후 (timestamp, nonce, signature) 반환.
+
+    본문을 읽기 전에 헤더 누락, 시각 차이, 재전송을 거부합니다.
+    """
+    timestamp = headers.get(HEADER_TIMESTAMP, "")
+    nonce = headers.get(HEADER_NONCE, "")
+    signature = headers.get(HEADER_SIGNATURE, "")
+    if not timestamp or not nonce or not signature:
+        raise InvalidSignature("서명 헤더 없음")
+    if not (timestamp + nonce + signature).isascii():
+        raise InvalidSignature("서명 헤더에 ASCII가 아닌 문자")
+
+    try:
+        skew = abs((now if now is not None else time.time()) - int(timestamp))
+    except ValueError as err:
+        raise InvalidSignature(f"잘못된 시각: {timestamp}") from err
+    if skew > SIGNATURE_MAX_SKEW:
+        raise InvalidSignature(f"허용 시간 초과: {skew:.0f}초")
+
+    if nonce in nonces:
+        raise InvalidSignature(f"재전송된 요청: {nonce}")
+    return timestamp, nonce, signature
+
+
+def verify_signature(
+    secret: str, timestamp: str, nonce: str, signature: str, body: bytes
+) -> None:
+    """본문(aiohttp가 압축을 푼 JSON) HMAC-SHA256 서명 확인."""
+    message = f"{timestamp}.{nonce}.".encode() + body
+    expected = hmac.new(secret.encode(), message, hashlib.sha256).hexdigest()
+    # str 비교는 ASCII가 아니면 TypeError이므로 바이트로 비교
+    if not hmac.compare_digest(
+        f"sha256={expected}".encode(), signature.encode("utf-8", "surrogateescape")
+    ):
+        raise InvalidSignature("서명 불일치")
 
 
 def is_phone_number(id_value: str) -> bool:
@@ -35,3 +136,46 @@ def format_amount(value: int | None) -> str:
     if value is None:
         return "0원"
     return f"{value:,}원"
+
+
+# aiohttp가 핸들러에 넘기기 전에 압축을 푸는 Content-Encoding
+DECODED_ENCODINGS = ("", "identity", "gzip", "deflate", "br", "zstd")
+
+
+async def read_webhook_json(
+    request: web.Request,
+    max_size: int,
+    verify: Callable[[bytes], None] | None = None,
+) -> Any:
+    """Webhook 본문을 스트리밍으로 읽고 JSON으로 파싱.
+
+    압축된 본문은 aiohttp가 풀어서 전달하므로, 풀린 크기가 max_size를 넘으면
+    PayloadTooLarge를 발생시킵니다.
+    verify를 지정하면 파싱 전에 본문 전체로 먼저 호출합니다.
+    """
+    encoding = request.headers.get(hdrs.CONTENT_ENCODING, "").strip().lower()
+    if encoding not in DECODED_ENCODINGS:
+        raise UnsupportedEncoding(f"지원하지 않는 인코딩: {encoding}")
+
+    body = bytearray()
+    async for chunk in request.content.iter_chunked(64 * 1024):
+        body += chunk
+        if len(body) > max_size:
+            raise PayloadTooLarge(f"본문 크기 초과: {max_size} bytes")
+
+    if request.content_length and body:
+        LOGGER.debug(
+            "Webhook 본문(%s): %d → %d bytes (%.1f배)",
+            encoding or "identity",
+            request.content_length,
+            len(body),
+            len(body) / request.content_length,
+        )
+
+    if verify is not None:
+        verify(bytes(body))
+
+    try:
+        return json.loads(body)
+    except ValueError as err:
+        raise InvalidPayload(f"JSON 해석 실패: {err}") from err
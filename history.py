@@ -0,0 +1,226 @@
+"""APT.i 월별 요금 이력 저장소.
+
+관리비 항목과 에너지 요금을 부과월 단위로 로컬 SQLite에 쌓아 두고,
+Home Assistant 장기 통계(외부 통계)로 가져옵니다.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+import os
+import sqlite3
+import threading
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util, slugify
+
+from .api import APTiData
+from .const import DOMAIN, LOGGER, UNIT_KRW
+
+# 이력으로 남기는 섹션 (알림 키와 같은 이름)
+HISTORY_SECTIONS = ("maint_payment", "maint_items", "energy_category", "energy_type")
+
+# 관리비 합계 행의 항목명
+TOTAL_ITEM = "합계"
+
+# 통계 이름에 붙일 섹션 이름
+SECTION_LABELS = {
+    "maint_payment": "관리비",
+    "maint_items": "관리비",
+    "energy_category": "에너지 요금",
+    "energy_type": "에너지 상세",
+}
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS bills (
+        month TEXT NOT NULL,
+        section TEXT NOT NULL,
+        item TEXT NOT NULL,
+        amount INTEGER NOT NULL,
+        PRIMARY KEY (section, item, month)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS payments (
+        date TEXT NOT NULL,
+        billing_month TEXT NOT NULL,
+        amount INTEGER,
+        method TEXT,
+        status TEXT,
+        PRIMARY KEY (date, billing_month)
+    ) WITHOUT ROWID
+    """,
+)
+
+
+def billing_month(data: APTiData) -> str | None:
+    """부과월(YYYY-MM) 계산.
+
+    페이지에는 월만 있으므로 수집 시각 기준으로 연도를 정합니다
+    (수집 월보다 뒤의 월이면 전년도).
+    """
+    try:
+        month = int(data.maint_payment.month or "")
+    except ValueError:
+        return None
+    if not 1 <= month <= 12:
+        return None
+
+    collected = dt_util.parse_datetime(data.last_update) if data.last_update else None
+    if collected is None:
+        collected = dt_util.now()
+    year = collected.year if month <= collected.month else collected.year - 1
+    return f"{year:04d}-{month:02d}"
+
+
+def history_rows(data: APTiData) -> list[tuple[str, str, str, int]]:
+    """데이터에서 이력 행 (부과월, 섹션, 항목, 금액) 추출."""
+    month = billing_month(data)
+    if month is None:
+        return []
+
+    rows = []
+    charged = data.maint_payment.charged
+    if charged is None:
+        charged = data.maint_payment.amount
+    if charged is not None:
+        rows.append((month, "maint_payment", TOTAL_ITEM, charged))
+    for item in data.maint_items:
+        if item.current is not None:
+            rows.append((month, "maint_items", item.name, item.current))
+    for energy in data.energy_category:
+        if energy.cost is not None:
+            rows.append((month, "energy_category", energy.type, energy.cost))
+    for bill in data.energy_type:
+        if bill.total is not None:
+            rows.append((month, "energy_type", bill.type, bill.total))
+    return rows
+
+
+def payment_rows(data: APTiData) -> list[tuple]:
+    """납부내역 행 (납부일, 부과월, 금액, 납부방법, 상태) 추출."""
+    return [
+        (
+            payment.date,
+            payment.billing_month or "",
+            payment.amount,
+            payment.method,
+            payment.status,
+        )
+        for payment in data.payment_history
+    ]
+
+
+class APTiHistory:
+    """엔트리별 월별 요금 이력 (SQLite).
+
+    모든 메서드는 블로킹이므로 executor에서 호출합니다.
+    """
+
+    def __init__(self, path: str) -> None:
+        """초기화."""
+        self.path = path
+        self._conn: sqlite3.Connection | None = None
+        # executor 스레드 간 연결 공유
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """연결 (처음 호출 시 스키마 생성)."""
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            with self._conn:
+                for statement in _SCHEMA:
+                    self._conn.execute(statement)
+        return self._conn
+
+    def record(
+        self, rows: list[tuple[str, str, str, int]], payments: list[tuple]
+    ) -> set[tuple[str, str]]:
+        """이력 행을 기록하고 값이 바뀐 (섹션, 항목) 반환."""
+        changed = set()
+        with self._lock, self._connect() as conn:
+            for month, section, item, amount in rows:
+                cursor = conn.execute(
+                    "INSERT INTO bills (month, section, item, amount) "
+                    "VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (section, item, month) DO UPDATE "
+                    "SET amount = excluded.amount WHERE amount != excluded.amount",
+                    (month, section, item, amount),
+                )
+                if cursor.rowcount:
+                    changed.add((section, item))
+            conn.executemany(
+                "INSERT OR IGNORE INTO payments "
+                "(date, billing_month, amount, method, status) VALUES (?, ?, ?, ?, ?)",
+                payments,
+            )
+        return changed
+
+    def series(self, section: str, item: str) -> list[tuple[str, int]]:
+        """항목의 월별 금액 (부과월 순)."""
+        with self._lock:
+            return self._connect().execute(
+                "SELECT month, amount FROM bills WHERE section = ? AND item = ? "
+                "ORDER BY month",
+                (section, item),
+            ).fetchall()
+
+    def close(self) -> None:
+        """연결 종료."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def history_path(hass: HomeAssistant, entry_id: str) -> str:
+    """엔트리별 이력 파일 경로."""
+    return hass.config.path(DOMAIN, f"{entry_id}.db")
+
+
+def statistic_id(entry_id: str, section: str, item: str) -> str:
+    """외부 통계 ID."""
+    return f"{DOMAIN}:{slugify(f'{entry_id}_{section}_{item}')}"
+
+
+async def async_import_statistics(
+    hass: HomeAssistant,
+    history: APTiHistory,
+    entry_id: str,
+    keys: set[tuple[str, str]],
+) -> None:
+    """바뀐 항목의 월별 이력을 장기 통계로 가져오기 (월 1개 값으로 다운샘플)."""
+    if not keys or "recorder" not in hass.config.components:
+        return
+
+    from homeassistant.components.recorder.models import (
+        StatisticData,
+        StatisticMetaData,
+    )
+    from homeassistant.components.recorder.statistics import (
+        async_add_external_statistics,
+    )
+
+    for section, item in sorted(keys):
+        series = await hass.async_add_executor_job(history.series, section, item)
+        statistics = []
+        total = 0
+        for month, amount in series:
+            total += amount
+            start = datetime.strptime(month, "%Y-%m").replace(
+                tzinfo=dt_util.get_default_time_zone()
+            )
+            statistics.append(StatisticData(start=start, state=amount, sum=total))
+
+        metadata = StatisticMetaData(
+            has_mean=False,
+            has_sum=True,
+            name=f"APT.i {SECTION_LABELS[section]} {item}",
+            source=DOMAIN,
+            statistic_id=statistic_id(entry_id, section, item),
+            unit_of_measurement=UNIT_KRW,
+        )
+        async_add_external_statistics(hass, metadata, statistics)
+
+    LOGGER.debug("장기 통계 가져오기: %d개 항목", len(keys))
@@ -0,0 +1,204 @@
+"""APT.i Webhook 페이로드 스키마 검증 및 정규화.
+
+섹션마다 필드 → 변환 함수를 선언해 두고, 잘못된 값이 있으면 섹션 전체를 거부합니다.
+표시용 숫자 칸의 "-", "▲1,200" 같은 값은 거부하지 않고 읽을 수 있는 만큼 읽습니다.
+변환이 끝난 섹션은 금액이 정수, 월이 "1"~"12" 문자열인 JSON 값입니다.
+"""
+from __future__ import annotations
+
+from collections.abc import Callable
+from datetime import datetime
+import re
+from typing import Any
+
+# 동호 (동 4자리 + 호 4자리)
+_DONG_HO_RE = re.compile(r"^\d{8}$")
+# 납부일 (YYYY.MM.DD로 시작)
+_DATE_RE = re.compile(r"^\d{4}\.\d{2}\.\d{2}")
+# 증감 표시 기호 → 부호
+_SIGNS = {"▲": "+", "△": "+", "▼": "-", "▽": "-"}
+
+
+class SchemaError(ValueError):
+    """페이로드 값이 스키마와 맞지 않음."""
+
+
+def amount(value: Any) -> int | None:
+    """금액 (정수 또는 "1,234원" 형태 문자열, 빈 값은 None)."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, bool):
+        raise SchemaError(f"금액이 아님: {value!r}")
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str):
+        cleaned = value.replace(",", "").replace("원", "").strip()
+        if re.fullmatch(r"[+-]?\d+", cleaned):
+            return int(cleaned)
+    raise SchemaError(f"금액이 아님: {value!r}")
+
+
+def cell_amount(value: Any) -> int | None:
+    """표시용 숫자 칸 ("▲1,200" → 1200, "▼500" → -500, "-" 등 숫자가 아니면 None)."""
+    if not isinstance(value, str):
+        return amount(value)
+    cleaned = value.replace(" ", "")
+    for mark, sign in _SIGNS.items():
+        cleaned = cleaned.replace(mark, sign)
+    try:
+        return amount(cleaned)
+    except SchemaError:
+        return None
+
+
+def text(value: Any) -> str | None:
+    """문자열 (앞뒤 공백 제거, 숫자는 문자열로)."""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    if isinstance(value, str):
+        return value.strip()
+    raise SchemaError(f"문자열이 아님: {value!r}")
+
+
+def required_text(value: Any) -> str:
+    """비어 있으면 안 되는 문자열."""
+    result = text(value)
+    if not result:
+        raise SchemaError("필수 값 없음")
+    return result
+
+
+def month(value: Any) -> str | None:
+    """부과월 ("09", 9 → "9")."""
+    result = text(value)
+    if not result:
+        return None
+    if not result.isdigit() or not 1 <= int(result) <= 12:
+        raise SchemaError(f"월이 아님: {value!r}")
+    return str(int(result))
+
+
+def paid_date(value: Any) -> str:
+    """납부일 (YYYY.MM.DD로 시작하는 문자열)."""
+    result = required_text(value)
+    if not _DATE_RE.match(result):
+        raise SchemaError(f"납부일이 아님: {value!r}")
+    return result
+
+
+def detail(value: Any) -> int | str | None:
+    """에너지 상세 항목 (숫자면 정수, 아니면 문자열)."""
+    try:
+        return amount(value)
+    except SchemaError:
+        return text(value)
+
+
+def dong_ho(value: Any) -> str:
+    """동호 ("1306-1001" 등 → "13061001", 없으면 빈 문자열)."""
+    result = text(value) or ""
+    digits = result.replace("-", "").replace(" ", "")
+    if digits and not _DONG_HO_RE.match(digits):
+        raise SchemaError(f"동호가 아님: {value!r}")
+    return digits
+
+
+def timestamp(value: Any) -> str | None:
+    """수집 시각 (ISO 8601)."""
+    result = text(value)
+    if not result:
+        return None
+    try:
+        datetime.fromisoformat(result)
+    except ValueError as err:
+        raise SchemaError(f"시각이 아님: {value!r}") from err
+    return result
+
+
+# 섹션별 필드 → 변환 함수
+RECORD_SCHEMAS: dict[str, dict[str, Callable[[Any], Any]]] = {
+    "maint_items": {
+        "item": required_text,
+        "current": cell_amount,
+        "previous": cell_amount,
+        "change": cell_amount,
+    },
+    "maint_payment": {
+        "amount": cell_amount,
+        "charged": cell_amount,
+        "month": month,
+        "deadline": text,
+        "status": text,
+    },
+    "energy_category": {
+        "type": required_text,
+        "usage": text,
+        "cost": cell_amount,
+        "comparison": text,
+    },
+    "energy_type": {
+        "type": required_text,
+        "total": cell_amount,
+        "comparison": text,
+    },
+    "payment_history": {
+        "date": paid_date,
+        "amount": cell_amount,
+        "billing_month": text,
+        "deadline": text,
+        "bank": text,
+        "method": text,
+        "status": text,
+    },
+}
+
+# 스키마에 없는 필드를 그대로 두는 섹션 → 나머지 필드 변환 함수
+EXTRA_FIELDS: dict[str, Callable[[Any], Any]] = {
+    "energy_type": detail,
+}
+
+# 목록이 아니라 객체 하나인 섹션
+SINGLE_RECORD_SECTIONS = ("maint_payment",)
+
+
+def _normalize_record(section: str, record: Any) -> dict:
+    """레코드 하나 검증 및 정규화."""
+    if not isinstance(record, dict):
+        raise SchemaError(f"객체가 아님: {type(record).__name__}")
+
+    schema = RECORD_SCHEMAS[section]
+    extra = EXTRA_FIELDS.get(section)
+    normalized = {}
+    for key, value in record.items():
+        convert = schema.get(key, extra)
+        if convert is None:
+            continue
+        try:
+            normalized[key] = convert(value)
+        except SchemaError as err:
+            raise SchemaError(f"{key}: {err}") from None
+
+    for key, convert in schema.items():
+        if key not in normalized and convert in (required_text, paid_date):
+            raise SchemaError(f"{key}: 필수 값 없음")
+    return normalized
+
+
+def normalize_section(section: str, value: Any) -> Any:
+    """섹션 검증 및 정규화 (잘못된 값이 있으면 SchemaError)."""
+    if section in SINGLE_RECORD_SECTIONS:
+        return _normalize_record(section, value)
+
+    if not isinstance(value, list):
+        raise SchemaError(f"목록이 아님: {type(value).__name__}")
+    records = []
+    for index, record in enumerate(value):
+        try:
+            records.append(_normalize_record(section, record))
+        except SchemaError as err:
+            raise SchemaError(f"{index}번째 항목 {err}") from None
+    return records
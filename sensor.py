@@ -2,8 +2,11 @@
 
 from __future__ import annotations
 
-from homeassistant.core import HomeAssistant
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.components.sensor import (
     SensorEntity,
@@ -11,10 +14,13 @@ from homeassistant.components.sensor import (
     SensorStateClass,
 )
 
+from .api import UPDATE_KEY_ANY, EnergyBill, EnergyCategory, MaintItem, update_key
 from .coordinator import APTiDataUpdateCoordinator
 from .entity import APTiEntity
 from .const import (
+    DOMAIN,
     LOGGER,
+    STALE_ENTITY_UPDATES,
     ICON_MONEY,
     ICON_ELECTRICITY,
     ICON_WATER,
@@ -42,29 +48,140 @@ async def async_setup_entry(
     # 관리비 납부 마감일 센서
     entities.append(APTiMaintenanceDeadlineSensor(coordinator))
 
-    # 관리비 항목별 센서
-    if coordinator.data and coordinator.data.maint_items:
-        for item in coordinator.data.maint_items:
-            entities.append(APTiMaintenanceItemSensor(coordinator, item))
-
-    # 에너지 카테고리별 센서
-    if coordinator.data and coordinator.data.energy_category:
-        for energy in coordinator.data.energy_category:
-            entities.append(APTiEnergyCategorySensor(coordinator, energy))
-
-    # 에너지 종류별 센서
-    if coordinator.data and coordinator.data.energy_type:
-        for energy in coordinator.data.energy_type:
-            entities.append(APTiEnergyTypeSensor(coordinator, energy))
-
     # 최근 납부내역 센서
     entities.append(APTiPaymentHistorySensor(coordinator))
 
     async_add_entities(entities)
     LOGGER.info("APT.i 센서 %d개 등록 완료", len(entities))
 
+    # 관리비 항목별, 에너지 카테고리별, 에너지 종류별 센서는 데이터에 맞춰 추가/제거
+    dynamic = APTiDynamicSensors(
+        hass,
+        coordinator,
+        async_add_entities,
+        {entity.unique_id for entity in entities},
+    )
+    dynamic.async_sync()
+    entry.async_on_unload(
+        coordinator.async_add_key_listener((UPDATE_KEY_ANY,), dynamic.async_sync)
+    )
+
+
+class APTiDynamicSensors:
+    """데이터에 있는 항목에 맞춰 항목별 센서를 추가하고 오래 빠진 센서를 제거."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: APTiDataUpdateCoordinator,
+        async_add_entities: AddEntitiesCallback,
+        static_unique_ids: set[str],
+    ) -> None:
+        """초기화."""
+        self._hass = hass
+        self._coordinator = coordinator
+        self._async_add_entities = async_add_entities
+        # unique_id → 엔티티 (레지스트리에만 있고 아직 만들지 않았으면 None)
+        self._tracked: dict[str, SensorEntity | None] = {}
+        # unique_id → 연속으로 빠진 업데이트 수
+        self._missing: dict[str, int] = {}
+
+        # 이전 실행에서 등록된 항목별 센서도 추적해 오래 빠지면 정리
+        registry = er.async_get(hass)
+        for registry_entry in er.async_entries_for_config_entry(
+            registry, coordinator.entry.entry_id
+        ):
+            if (
+                registry_entry.domain == "sensor"
+                and registry_entry.unique_id not in static_unique_ids
+            ):
+                self._tracked[registry_entry.unique_id] = None
+
+    @callback
+    def async_sync(self) -> None:
+        """현재 데이터와 항목별 센서 동기화."""
+        data = self._coordinator.data
+        if not data:
+            return
+
+        entry_id = self._coordinator.entry.entry_id
+        current: set[str] = set()
+        new_entities: list[SensorEntity] = []
+
+        for records, sensor_class in (
+            (data.maint_items, APTiMaintenanceItemSensor),
+            (data.energy_category, APTiEnergyCategorySensor),
+            (data.energy_type, APTiEnergyTypeSensor),
+        ):
+            for record in records:
+                unique_id = sensor_class.build_unique_id(entry_id, record)
+                if unique_id in current:
+                    continue
+                current.add(unique_id)
+                if self._tracked.get(unique_id) is None:
+                    entity = sensor_class(self._coordinator, record)
+                    self._tracked[unique_id] = entity
+                    new_entities.append(entity)
+
+        for unique_id in list(self._tracked):
+            if unique_id in current:
+                self._missing.pop(unique_id, None)
+                continue
+            missing = self._missing.get(unique_id, 0) + 1
+            if missing >= STALE_ENTITY_UPDATES:
+                self._retire(unique_id)
+            else:
+                self._missing[unique_id] = missing
+
+        if new_entities:
+            self._async_add_entities(new_entities)
+            LOGGER.info("APT.i 항목별 센서 %d개 추가", len(new_entities))
+
+    @callback
+    def _retire(self, unique_id: str) -> None:
+        """항목별 센서 제거 (엔티티 레지스트리에서도 삭제)."""
+        entity = self._tracked.pop(unique_id)
+        self._missing.pop(unique_id, None)
+
+        registry = er.async_get(self._hass)
+        entity_id = registry.async_get_entity_id("sensor", DOMAIN, unique_id)
+        if entity_id:
+            registry.async_remove(entity_id)
+        elif entity is not None:
+            self._hass.async_create_task(entity.async_remove())
+        LOGGER.info("APT.i 항목별 센서 제거: %s", entity_id or unique_id)
+
+
+class APTiSensor(APTiEntity, SensorEntity):
+    """APT.i 센서 기본 클래스.
+
+    상태값과 속성은 데이터 리비전마다 한 번만 계산합니다.
+    """
+
+    @property
+    def native_value(self) -> Any:
+        """Return the state."""
+        return self._memoize("native_value", self._compute_native_value)
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        """Return extra state attributes."""
+        attrs = self._memoize("attributes", self._compute_attributes)
+        if self.coordinator.is_stale:
+            # 시간이 지나며 바뀌므로 캐시하지 않음
+            return {**attrs, "오래된 데이터": True}
+        return attrs
+
+    def _compute_native_value(self) -> Any:
+        """상태값 계산."""
+        return None
 
-class APTiMaintenanceTotalSensor(APTiEntity, SensorEntity):
+    def _compute_attributes(self) -> dict:
+        """속성 계산."""
+        return {}
+
+
+class APTiMaintenanceTotalSensor(APTiSensor):
     """관리비 총액 센서."""
 
     _attr_device_class = SensorDeviceClass.MONETARY
@@ -77,59 +194,45 @@ class APTiMaintenanceTotalSensor(APTiEntity, SensorEntity):
         super().__init__(coordinator, "관리비")
         self._attr_unique_id = f"{coordinator.entry.entry_id}_maint_total"
         self._attr_translation_key = "maint_total"
+        self._listen_keys = (update_key("maint_payment"), update_key("maint_items"))
         self._attr_name = "납부할 금액"
 
-    @property
-    def native_value(self) -> int | None:
-        """Return the state."""
+    def _compute_native_value(self) -> int | None:
+        """상태값 계산."""
         if not self.coordinator.data:
             return None
 
-        payment = self.coordinator.data.maint_payment
-        if payment and "amount" in payment:
-            try:
-                return int(payment["amount"])
-            except (ValueError, TypeError):
-                return None
-        return None
+        return self.coordinator.data.maint_payment.amount
 
-    @property
-    def extra_state_attributes(self) -> dict:
-        """Return extra state attributes."""
+    def _compute_attributes(self) -> dict:
+        """속성 계산."""
         if not self.coordinator.data:
             return {}
 
         payment = self.coordinator.data.maint_payment
         attrs = {}
 
-        if payment:
-            if "charged" in payment:
-                attrs["부과금액"] = f"{int(payment['charged']):,}원"
-            if "month" in payment:
-                attrs["부과월"] = f"{payment['month']}월"
-            if "deadline" in payment:
-                attrs["납부마감일"] = payment["deadline"]
-            if "status" in payment:
-                attrs["상태"] = payment["status"]
+        if payment.charged is not None:
+            attrs["부과금액"] = f"{payment.charged:,}원"
+        if payment.month is not None:
+            attrs["부과월"] = f"{payment.month}월"
+        if payment.deadline is not None:
+            attrs["납부마감일"] = payment.deadline
+        if payment.status is not None:
+            attrs["상태"] = payment.status
 
         # 관리비 항목 요약
         if self.coordinator.data.maint_items:
-            items = self.coordinator.data.maint_items
-            attrs["항목수"] = len(items)
-
-            # 상위 3개 항목
-            sorted_items = sorted(
-                items,
-                key=lambda x: int(x.get("current", 0) or 0),
-                reverse=True
-            )[:3]
-            for i, item in enumerate(sorted_items, 1):
-                attrs[f"항목{i}"] = f"{item['item']}: {int(item['current']):,}원"
+            attrs["항목수"] = len(self.coordinator.data.maint_items)
+
+            # 상위 3개 항목 (수신 시 정렬해 둠)
+            for i, item in enumerate(self.coordinator.data.top_maint_items, 1):
+                attrs[f"항목{i}"] = f"{item.name}: {item.current or 0:,}원"
 
         return attrs
 
 
-class APTiMaintenanceDeadlineSensor(APTiEntity, SensorEntity):
+class APTiMaintenanceDeadlineSensor(APTiSensor):
     """관리비 납부 마감일 센서."""
 
     _attr_icon = ICON_CALENDAR
@@ -139,21 +242,18 @@ class APTiMaintenanceDeadlineSensor(APTiEntity, SensorEntity):
         super().__init__(coordinator, "관리비")
         self._attr_unique_id = f"{coordinator.entry.entry_id}_maint_deadline"
         self._attr_translation_key = "maint_deadline"
+        self._listen_keys = (update_key("maint_payment"),)
         self._attr_name = "납부마감일"
 
-    @property
-    def native_value(self) -> str | None:
-        """Return the state."""
+    def _compute_native_value(self) -> str | None:
+        """상태값 계산."""
         if not self.coordinator.data:
             return None
 
-        payment = self.coordinator.data.maint_payment
-        if payment and "deadline" in payment:
-            return payment["deadline"]
-        return None
+        return self.coordinator.data.maint_payment.deadline
 
 
-class APTiMaintenanceItemSensor(APTiEntity, SensorEntity):
+class APTiMaintenanceItemSensor(APTiSensor):
     """관리비 항목별 센서."""
 
     _attr_device_class = SensorDeviceClass.MONETARY
@@ -164,55 +264,48 @@ class APTiMaintenanceItemSensor(APTiEntity, SensorEntity):
     def __init__(
         self,
         coordinator: APTiDataUpdateCoordinator,
-        item: dict,
+        item: MaintItem,
     ) -> None:
         """Initialize sensor."""
         super().__init__(coordinator, "관리비")
-        self._item_name = item.get("item", "")
-        self._attr_unique_id = f"{coordinator.entry.entry_id}_maint_{self._item_name}"
+        self._item_name = item.name
+        self._attr_unique_id = self.build_unique_id(coordinator.entry.entry_id, item)
         self._attr_name = self._item_name
+        self._listen_keys = (update_key("maint_items", self._item_name),)
 
-    @property
-    def native_value(self) -> int | None:
-        """Return the state."""
+    @staticmethod
+    def build_unique_id(entry_id: str, item: MaintItem) -> str:
+        """항목의 unique_id."""
+        return f"{entry_id}_maint_{item.name}"
+
+    def _compute_native_value(self) -> int | None:
+        """상태값 계산."""
         if not self.coordinator.data:
             return None
 
-        for item in self.coordinator.data.maint_items:
-            if item.get("item") == self._item_name:
-                try:
-                    return int(item.get("current", 0) or 0)
-                except (ValueError, TypeError):
-                    return None
-        return None
+        item = self.coordinator.data.maint_index.get(self._item_name)
+        if item is None:
+            return None
+        return item.current or 0
 
-    @property
-    def extra_state_attributes(self) -> dict:
-        """Return extra state attributes."""
+    def _compute_attributes(self) -> dict:
+        """속성 계산."""
         if not self.coordinator.data:
             return {}
 
-        for item in self.coordinator.data.maint_items:
-            if item.get("item") == self._item_name:
-                attrs = {}
-                if "previous" in item:
-                    try:
-                        attrs["전월"] = f"{int(item['previous']):,}원"
-                    except (ValueError, TypeError):
-                        attrs["전월"] = item["previous"]
-
-                if "change" in item:
-                    try:
-                        change = int(item["change"])
-                        attrs["증감"] = f"{change:+,}원"
-                    except (ValueError, TypeError):
-                        attrs["증감"] = item["change"]
-
-                return attrs
-        return {}
+        item = self.coordinator.data.maint_index.get(self._item_name)
+        if item is None:
+            return {}
+
+        attrs = {}
+        if item.previous is not None:
+            attrs["전월"] = f"{item.previous:,}원"
+        if item.change is not None:
+            attrs["증감"] = f"{item.change:+,}원"
+        return attrs
 
 
-class APTiEnergyCategorySensor(APTiEntity, SensorEntity):
+class APTiEnergyCategorySensor(APTiSensor):
     """에너지 카테고리별 센서."""
 
     _attr_device_class = SensorDeviceClass.MONETARY
@@ -222,47 +315,49 @@ class APTiEnergyCategorySensor(APTiEntity, SensorEntity):
     def __init__(
         self,
         coordinator: APTiDataUpdateCoordinator,
-        energy: dict,
+        energy: EnergyCategory,
     ) -> None:
         """Initialize sensor."""
         super().__init__(coordinator, "에너지")
-        self._energy_type = energy.get("type", "")
-        self._attr_unique_id = f"{coordinator.entry.entry_id}_energy_{self._energy_type}"
+        self._energy_type = energy.type
+        self._attr_unique_id = self.build_unique_id(coordinator.entry.entry_id, energy)
         self._attr_name = f"{self._energy_type} 요금"
+        self._listen_keys = (update_key("energy_category", self._energy_type),)
         self._attr_icon = ENERGY_ICONS.get(self._energy_type, ICON_ELECTRICITY)
 
-    @property
-    def native_value(self) -> int | None:
-        """Return the state."""
+    @staticmethod
+    def build_unique_id(entry_id: str, energy: EnergyCategory) -> str:
+        """에너지 카테고리의 unique_id."""
+        return f"{entry_id}_energy_{energy.type}"
+
+    def _compute_native_value(self) -> int | None:
+        """상태값 계산."""
         if not self.coordinator.data:
             return None
 
-        for energy in self.coordinator.data.energy_category:
-            if energy.get("type") == self._energy_type:
-                try:
-                    return int(energy.get("cost", 0) or 0)
-                except (ValueError, TypeError):
-                    return None
-        return None
+        energy = self.coordinator.data.energy_category_index.get(self._energy_type)
+        if energy is None:
+            return None
+        return energy.cost or 0
 
-    @property
-    def extra_state_attributes(self) -> dict:
-        """Return extra state attributes."""
+    def _compute_attributes(self) -> dict:
+        """속성 계산."""
         if not self.coordinator.data:
             return {}
 
-        for energy in self.coordinator.data.energy_category:
-            if energy.get("type") == self._energy_type:
-                attrs = {}
-                if "usage" in energy:
-                    attrs["사용량"] = energy["usage"]
-                if "comparison" in energy:
-                    attrs["비교"] = energy["comparison"]
-                return attrs
-        return {}
+        energy = self.coordinator.data.energy_category_index.get(self._energy_type)
+        if energy is None:
+            return {}
+
+        attrs = {}
+        if energy.usage is not None:
+            attrs["사용량"] = energy.usage
+        if energy.comparison is not None:
+            attrs["비교"] = energy.comparison
+        return attrs
 
 
-class APTiEnergyTypeSensor(APTiEntity, SensorEntity):
+class APTiEnergyTypeSensor(APTiSensor):
     """에너지 종류별 상세 센서."""
 
     _attr_device_class = SensorDeviceClass.MONETARY
@@ -272,53 +367,51 @@ class APTiEnergyTypeSensor(APTiEntity, SensorEntity):
     def __init__(
         self,
         coordinator: APTiDataUpdateCoordinator,
-        energy: dict,
+        energy: EnergyBill,
     ) -> None:
         """Initialize sensor."""
         super().__init__(coordinator, "에너지")
-        self._energy_type = energy.get("type", "")
-        self._attr_unique_id = f"{coordinator.entry.entry_id}_energy_type_{self._energy_type}"
+        self._energy_type = energy.type
+        self._attr_unique_id = self.build_unique_id(coordinator.entry.entry_id, energy)
         self._attr_name = f"{self._energy_type} 상세"
+        self._listen_keys = (update_key("energy_type", self._energy_type),)
         self._attr_icon = ENERGY_ICONS.get(self._energy_type, ICON_ELECTRICITY)
 
-    @property
-    def native_value(self) -> int | None:
-        """Return the state."""
+    @staticmethod
+    def build_unique_id(entry_id: str, energy: EnergyBill) -> str:
+        """에너지 종류의 unique_id."""
+        return f"{entry_id}_energy_type_{energy.type}"
+
+    def _compute_native_value(self) -> int | None:
+        """상태값 계산."""
         if not self.coordinator.data:
             return None
 
-        for energy in self.coordinator.data.energy_type:
-            if energy.get("type") == self._energy_type:
-                try:
-                    return int(energy.get("total", 0) or 0)
-                except (ValueError, TypeError):
-                    return None
-        return None
+        energy = self.coordinator.data.energy_type_index.get(self._energy_type)
+        if energy is None:
+            return None
+        return energy.total or 0
 
-    @property
-    def extra_state_attributes(self) -> dict:
-        """Return extra state attributes."""
+    def _compute_attributes(self) -> dict:
+        """속성 계산."""
         if not self.coordinator.data:
             return {}
 
-        for energy in self.coordinator.data.energy_type:
-            if energy.get("type") == self._energy_type:
-                attrs = {}
-                if "comparison" in energy:
-                    attrs["비교"] = energy["comparison"]
-
-                # 상세 항목 (type, total, comparison 제외한 모든 키)
-                for key, value in energy.items():
-                    if key not in ("type", "total", "comparison"):
-                        try:
-                            attrs[key] = f"{int(value):,}원"
-                        except (ValueError, TypeError):
-                            attrs[key] = value
-                return attrs
-        return {}
+        energy = self.coordinator.data.energy_type_index.get(self._energy_type)
+        if energy is None:
+            return {}
 
+        attrs = {}
+        if energy.comparison is not None:
+            attrs["비교"] = energy.comparison
+
+        # 상세 항목 (숫자는 원 단위로 표시)
+        for key, value in energy.details.items():
+            attrs[key] = f"{value:,}원" if isinstance(value, int) else value
+        return attrs
 
-class APTiPaymentHistorySensor(APTiEntity, SensorEntity):
+
+class APTiPaymentHistorySensor(APTiSensor):
     """납부내역 센서."""
 
     _attr_icon = ICON_RECEIPT
@@ -328,51 +421,43 @@ class APTiPaymentHistorySensor(APTiEntity, SensorEntity):
         super().__init__(coordinator, "납부내역")
         self._attr_unique_id = f"{coordinator.entry.entry_id}_payment_history"
         self._attr_translation_key = "payment_history"
+        self._listen_keys = (update_key("payment_history"),)
         self._attr_name = "최근 납부"
 
-    @property
-    def native_value(self) -> str | None:
-        """Return the state."""
+    def _compute_native_value(self) -> str | None:
+        """상태값 계산."""
         if not self.coordinator.data:
             return None
 
         history = self.coordinator.data.payment_history
-        if history and len(history) > 0:
-            latest = history[0]
-            return latest.get("status", "알 수 없음")
+        if history:
+            return history[0].status or "알 수 없음"
         return "내역 없음"
 
-    @property
-    def extra_state_attributes(self) -> dict:
-        """Return extra state attributes."""
+    def _compute_attributes(self) -> dict:
+        """속성 계산."""
         if not self.coordinator.data:
             return {}
 
         history = self.coordinator.data.payment_history
-        attrs = {"총건수": len(history) if history else 0}
+        attrs = {"총건수": len(history)}
 
-        if history and len(history) > 0:
+        if history:
             latest = history[0]
-            if "date" in latest:
-                attrs["결제일"] = latest["date"]
-            if "amount" in latest:
-                try:
-                    attrs["결제금액"] = f"{int(latest['amount']):,}원"
-                except (ValueError, TypeError):
-                    attrs["결제금액"] = latest["amount"]
-            if "billing_month" in latest:
-                attrs["청구월"] = latest["billing_month"]
-            if "method" in latest:
-                attrs["결제방법"] = latest["method"]
-            if "bank" in latest:
-                attrs["은행"] = latest["bank"]
+            if latest.date:
+                attrs["결제일"] = latest.date
+            if latest.amount is not None:
+                attrs["결제금액"] = f"{latest.amount:,}원"
+            if latest.billing_month is not None:
+                attrs["청구월"] = latest.billing_month
+            if latest.method is not None:
+                attrs["결제방법"] = latest.method
+            if latest.bank is not None:
+                attrs["은행"] = latest.bank
 
             # 최근 5건 요약
-            for i, item in enumerate(history[:5], 1):
-                if "date" in item and "amount" in item:
-                    try:
-                        attrs[f"내역{i}"] = f"{item['date']}: {int(item['amount']):,}원"
-                    except (ValueError, TypeError):
-                        attrs[f"내역{i}"] = f"{item['date']}: {item['amount']}"
+            for i, payment in enumerate(history[:5], 1):
+                if payment.date and payment.amount is not None:
+                    attrs[f"내역{i}"] = f"{payment.date}: {payment.amount:,}원"
 
         return attrs
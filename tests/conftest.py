@@ -0,0 +1,30 @@
+"""테스트 공통 설정.
+
+저장소 루트가 통합구성요소 패키지 자체이므로 "apti" 패키지로 불러옵니다.
+통합구성요소 테스트는 Home Assistant가 설치된 환경에서만 실행됩니다.
+"""
+
+import importlib.util
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# apti_parser.py, apti_bench.py는 독립 스크립트
+sys.path.insert(0, ROOT)
+
+
+@pytest.fixture(scope="session")
+def apti():
+    """통합구성요소 패키지."""
+    pytest.importorskip("homeassistant")
+    if "apti" not in sys.modules:
+        spec = importlib.util.spec_from_file_location(
+            "apti", os.path.join(ROOT, "__init__.py"), submodule_search_locations=[ROOT]
+        )
+        module = importlib.util.module_from_spec(spec)
+        sys.modules["apti"] = module
+        spec.loader.exec_module(module)
+    return sys.modules["apti"]
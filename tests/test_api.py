@@ -0,0 +1,75 @@
+"""Webhook 페이로드 검증/병합 테스트."""
+
+import importlib
+
+import pytest
+
+
+@pytest.fixture
+def api(apti):
+    """api 모듈."""
+    return importlib.import_module("apti.api")
+
+
+RECORD = {
+    "date": "2026.09.25",
+    "amount": "231500",
+    "billing_month": "2026.08",
+    "deadline": "2026.09.30",
+    "bank": "국민은행",
+    "method": "자동이체",
+    "status": "완납",
+}
+
+
+def _delta(append) -> dict:
+    """납부내역 새 레코드만 담은 부분 페이로드."""
+    return {
+        "delta": True,
+        "base_version": "v1",
+        "version": "v2",
+        "payment_history": [RECORD],
+        "append": append,
+    }
+
+
+@pytest.mark.parametrize("append", ["payment_history", [{"x": 1}], [["payment_history"]]])
+def test_malformed_append_is_quarantined(api, append):
+    """append가 문자열 목록이 아니면 예외 없이 append 섹션을 격리."""
+    validated = api.validate_payload(_delta(append))
+    assert "payment_history" in validated.quarantined
+    assert "payment_history" not in validated.sections
+    assert validated.append == set()
+
+
+def test_unknown_append_section_is_ignored(api):
+    """append 대상이 아닌 섹션 이름은 무시."""
+    validated = api.validate_payload(_delta(["payment_history", "maint_items"]))
+    assert validated.append == {"payment_history"}
+    assert not validated.quarantined
+
+
+@pytest.mark.parametrize("malformed_first", [True, False])
+def test_merge_keeps_malformed_append(api, malformed_first):
+    """잘못된 append가 섞인 병합 결과도 예외 없이 격리."""
+    payloads = [_delta([{"x": 1}]), _delta(["payment_history"])]
+    if not malformed_first:
+        payloads.reverse()
+    merged = api.merge_payloads(*payloads)
+    assert "payment_history" in api.validate_payload(merged).quarantined
+
+
+def test_symbol_cells_do_not_quarantine_section(api):
+    """숫자 칸의 "-", "▲1,200"은 섹션을 격리하지 않고 읽을 수 있는 만큼 읽음."""
+    validated = api.validate_payload({
+        "maint_items": [
+            {"item": "일반관리비", "current": "52,300", "previous": "-", "change": "▲1,200"},
+            {"item": "전기료", "current": "61,040", "previous": "73,110", "change": "▼12,070"},
+        ],
+        "energy_category": [{"type": "가스", "usage": "-", "cost": "-"}],
+    })
+    assert not validated.quarantined
+    _value, items = validated.sections["maint_items"]
+    assert [(item.previous, item.change) for item in items] == [(None, 1200), (73110, -12070)]
+    _value, energy = validated.sections["energy_category"]
+    assert energy[0].cost is None
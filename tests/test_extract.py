@@ -0,0 +1,216 @@
+"""섹션 추출 테스트.
+
+선언형 규칙(SECTION_SPECS)으로 바꾸기 전의 섹션별 추출 함수를 기준으로,
+페이지 fixture(fixtures/)에서 extract_sections가 같은 결과를 내는지 비교합니다.
+fixture 파일 이름은 APTI_RECORD_DIR로 저장한 것과 같아 실제 페이지로 바꿔 넣을 수 있습니다.
+"""
+
+import os
+import re
+
+import pytest
+
+apti_parser = pytest.importorskip("apti_parser")
+HTMLParser = apti_parser.HTMLParser
+_text = apti_parser._text
+_closest = apti_parser._closest
+_next_element = apti_parser._next_element
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+# 이전 추출 함수 (비교 기준, 수정하지 않음)
+
+
+def _has_class(node, name: str) -> bool:
+    """클래스 포함 여부."""
+    return name in (node.attributes.get("class") or "").split()
+
+
+def extract_dong_ho(tree: HTMLParser) -> str:
+    """동호 정보 추출 (HTML)."""
+    elem = tree.css_first("div.Nbox1_txt10")
+    if elem is not None:
+        match = re.search(r"(\d+)동\s*(\d+)호", elem.text())
+        if match:
+            return match[1].zfill(4) + match[2].zfill(4)
+    return ""
+
+
+def extract_maint_items(tree: HTMLParser) -> list:
+    """관리비 항목 추출 (HTML)."""
+    results = []
+    for link in tree.css("a.black"):
+        row = _closest(link, "tr")
+        if row is None:
+            continue
+        cells = row.css("td")
+        if len(cells) >= 4:
+            results.append({
+                "item": _text(link),
+                "current": _text(cells[1]).replace(",", ""),
+                "previous": _text(cells[2]).replace(",", ""),
+                "change": _text(cells[3]).replace(",", ""),
+            })
+    return results
+
+
+def extract_maint_payment(tree: HTMLParser) -> dict:
+    """관리비 납부액 추출 (HTML)."""
+    result = {}
+    cost_pay = tree.css_first("span.costPay")
+    if cost_pay is not None:
+        result["amount"] = _text(cost_pay).replace(",", "")
+    for dt in tree.css("div.costpayBox dt"):
+        dt_text = _text(dt)
+        if "월분 부과 금액" in dt_text:
+            dd = _next_element(dt)
+            if dd is not None and dd.tag == "dd":
+                result["charged"] = re.sub(r"[원,]", "", _text(dd))
+            month_match = re.search(r"(\d+)월분", dt_text)
+            if month_match:
+                result["month"] = month_match[1]
+            break
+    deadline = tree.css_first("div.endBox span")
+    if deadline is not None:
+        result["deadline"] = _text(deadline)
+    day_box = tree.css_first("div.dayBox p")
+    if day_box is not None:
+        result["status"] = _text(day_box)
+    return result
+
+
+def extract_energy_category(tree: HTMLParser) -> list:
+    """에너지 카테고리 추출 (HTML)."""
+    results = []
+    for box in tree.css("div.engBox"):
+        h3 = box.css_first("h3")
+        if h3 is None:
+            continue
+        energy_type = re.sub(r"[\n\t]", "", h3.text()).strip()
+        usage, cost, comparison = "0", "0", ""
+        eng_unit = box.css_first("ul.engUnit")
+        if eng_unit is not None:
+            found_line = False
+            for li in eng_unit.css("li"):
+                if _has_class(li, "line"):
+                    found_line = True
+                    continue
+                strong = li.css_first("strong")
+                if strong is not None:
+                    text = _text(strong)
+                    if not found_line:
+                        usage = text.replace(",", "")
+                    else:
+                        cost = text.replace(",", "").replace("원", "", 1)
+        txt_box = box.css_first("div.txtBox")
+        if txt_box is not None:
+            comp = txt_box.css_first("strong")
+            if comp is not None:
+                comparison = _text(comp)
+        if energy_type:
+            results.append({
+                "type": energy_type,
+                "usage": usage,
+                "cost": cost,
+                "comparison": comparison,
+            })
+    return results
+
+
+def extract_energy_type(tree: HTMLParser) -> list:
+    """에너지 종류별 추출 (HTML)."""
+    results = []
+    for box in tree.css("div.bill_box"):
+        info = {}
+        h3 = box.css_first("h3")
+        if h3 is not None:
+            info["type"] = re.sub(r"[\n\t]", "", h3.text()).strip()
+        total = box.css_first("span.totalBill strong")
+        if total is not None:
+            info["total"] = _text(total).replace(",", "")
+        compare = box.css_first("div.energy_data")
+        if compare is not None:
+            txt = compare.css_first("p.txt")
+            if txt is not None:
+                info["comparison"] = _text(txt)
+        tbl_bill = box.css_first("div.tbl_bill")
+        if tbl_bill is not None:
+            for row in tbl_bill.css("tr"):
+                for th, td in zip(row.css("th"), row.css("td")):
+                    info[_text(th)] = _text(td).replace("원", "", 1).replace(",", "")
+        if info.get("type"):
+            results.append(info)
+    return results
+
+
+def extract_payment_history(tree: HTMLParser) -> list:
+    """납부내역 추출 (HTML)."""
+    results = []
+    table = tree.css_first("div#hidden-xs2 table.table-w")
+    if table is None:
+        table = tree.css_first("table.table-w")
+    tbody = table.css_first("tbody") if table is not None else None
+    if tbody is None:
+        return results
+    for row in tbody.css("tr"):
+        cells = row.css("td")
+        if len(cells) < 7:
+            continue
+        date_text = _text(cells[0])
+        if re.search(r"\d{4}\.\d{2}\.\d{2}", date_text):
+            results.append({
+                "date": date_text,
+                "amount": _text(cells[1]).replace(",", ""),
+                "billing_month": _text(cells[2]),
+                "deadline": _text(cells[3]),
+                "bank": _text(cells[4]),
+                "method": _text(cells[5]),
+                "status": _text(cells[6]),
+            })
+    return results
+
+
+# 섹션 → (페이지 경로, 이전 추출 함수)
+LEGACY = {
+    "dong_ho": (apti_parser.APTiParser.DONG_HO_PAGE, extract_dong_ho),
+    "maint_items": (apti_parser.APTiParser.MAINT_PAGE, extract_maint_items),
+    "maint_payment": (apti_parser.APTiParser.MAINT_PAGE, extract_maint_payment),
+    "energy_category": (apti_parser.APTiParser.ENERGY_PAGE, extract_energy_category),
+    "energy_type": (apti_parser.APTiParser.ENERGY_GOGI_PAGE, extract_energy_type),
+    "payment_history": (apti_parser.APTiParser.PAYMENT_PAGE, extract_payment_history),
+}
+
+
+def _fixture(path: str) -> HTMLParser:
+    """페이지 fixture."""
+    with open(os.path.join(FIXTURES, apti_parser.fixture_name(path)), encoding="utf-8") as f:
+        return HTMLParser(f.read())
+
+
+def test_every_section_is_compared():
+    """모든 섹션에 비교 기준이 있음."""
+    assert set(LEGACY) == set(apti_parser.SECTION_SPECS)
+
+
+@pytest.mark.parametrize("key", sorted(LEGACY))
+def test_extract_sections_matches_legacy(key):
+    """extract_sections 결과가 이전 추출 함수와 같음."""
+    path, legacy = LEGACY[key]
+    tree = _fixture(path)
+    assert apti_parser.extract_sections(tree, (key,)) == {key: legacy(tree)}
+
+
+def test_energy_category_keeps_last_value_on_each_side():
+    """구분선 앞뒤에 값이 여럿이면 각각 마지막 값."""
+    tree = _fixture(apti_parser.APTiParser.ENERGY_PAGE)
+    electric = apti_parser.extract_sections(tree, ("energy_category",))["energy_category"][0]
+    assert (electric["usage"], electric["cost"]) == ("1234", "12000")
+
+
+def test_payment_history_stops_at_mark():
+    """지난번 마지막 레코드 앞까지만 읽음."""
+    tree = _fixture(apti_parser.APTiParser.PAYMENT_PAGE)
+    marks = {"payment_history": ["2026.08.25", "2026.07"]}
+    records = apti_parser.extract_sections(tree, ("payment_history",), marks)["payment_history"]
+    assert [record["date"] for record in records] == ["2026.09.25"]
@@ -0,0 +1,59 @@
+"""파서 테스트 (세션 확인, Webhook 전송)."""
+
+import asyncio
+from unittest import mock
+
+import pytest
+
+apti_parser = pytest.importorskip("apti_parser")
+
+
+def _probe(dong_ho: str) -> tuple[bool, dict]:
+    """동호 페이지에서 dong_ho가 읽힌 값으로 세션 확인."""
+    parser = apti_parser.APTiParser("user", "password")
+    parser._page = mock.Mock(evaluate=mock.AsyncMock(return_value={"dong_ho": dong_ho}))
+    loaded = {parser._page: parser.BASE_URL + parser.DONG_HO_PAGE}
+
+    async def fake_open(page, path, ready, timeout=None):
+        parser._loaded_urls.update(loaded)
+        return True
+
+    with mock.patch.object(parser, "_open", fake_open):
+        valid = asyncio.run(parser._probe_session())
+    return valid, parser._loaded_urls
+
+
+def test_probe_accepts_page_with_dong_ho():
+    """동호가 읽히면 세션 유효."""
+    assert _probe("13061001")[0]
+
+
+def test_probe_rejects_page_without_dong_ho():
+    """요소만 있고 동호가 비어 있으면 (오류/리다이렉트 페이지) 다시 로그인."""
+    valid, loaded_urls = _probe("")
+    assert not valid
+    # 로그인 후 이 페이지를 다시 불러옴
+    assert not loaded_urls
+
+
+def test_zstd_falls_back_to_gzip():
+    """Home Assistant가 zstd를 풀지 못해 400이면 gzip으로 다시 전송."""
+    pytest.importorskip("zstandard")
+    encodings = []
+
+    def handler(request):
+        encoding = request.headers.get("Content-Encoding")
+        encodings.append(encoding)
+        return apti_parser.httpx.Response(400 if encoding == "zstd" else 202)
+
+    async def run():
+        sender = apti_parser.WebhookSender(encoding="zstd", retries=0)
+        await sender.aclose()
+        sender._client = apti_parser.httpx.AsyncClient(
+            transport=apti_parser.httpx.MockTransport(handler)
+        )
+        async with sender:
+            return await sender.post("http://ha/api/webhook/test", {"dong_ho": "1"})
+
+    assert asyncio.run(run()) == 202
+    assert encodings == ["zstd", "gzip"]
@@ -0,0 +1,205 @@
+"""Webhook 수신 경로 테스트."""
+
+import asyncio
+import gzip
+import hashlib
+import hmac
+import importlib
+import time
+from unittest import mock
+
+from aiohttp import streams, web
+from aiohttp.test_utils import TestClient, TestServer, make_mocked_request
+import pytest
+
+
+def _stream() -> streams.StreamReader:
+    """아직 본문이 도착하지 않은 요청 스트림."""
+    protocol = mock.Mock(_reading_paused=False)
+    return streams.StreamReader(protocol, 2**16, loop=asyncio.get_running_loop())
+
+
+async def _request(body: bytes, headers: dict, payload=None):
+    """본문을 스트리밍으로 읽는 요청 (payload를 넘기면 본문은 나중에 전달)."""
+    if payload is None:
+        payload = _stream()
+        payload.feed_data(body)
+        payload.feed_eof()
+    return make_mocked_request("POST", "/api/webhook/test", headers=headers, payload=payload)
+
+
+def _route(apti):
+    """대기열만 확인하는 경로."""
+    return apti.WebhookRoute(coordinator=mock.Mock())
+
+
+def _client(apti, route) -> TestClient:
+    """실제 aiohttp 서버의 클라이언트 (압축 해제는 aiohttp가 처리)."""
+
+    async def handler(request):
+        return await apti._async_handle_route(route, "test", request)
+
+    app = web.Application()
+    app.router.add_post("/api/webhook/test", handler)
+    return TestClient(TestServer(app))
+
+
+async def _post(apti, route, body: bytes, headers: dict) -> int:
+    """실제 aiohttp 서버로 한 번 전송."""
+    async with _client(apti, route) as client:
+        response = await client.post("/api/webhook/test", data=body, headers=headers)
+        return response.status
+
+
+def _signed(body: bytes, nonce: str) -> dict:
+    """비밀키 "secret"으로 서명한 헤더."""
+    const = importlib.import_module("apti.const")
+    timestamp = str(int(time.time()))
+    digest = hmac.new(
+        b"secret", f"{timestamp}.{nonce}.".encode() + body, hashlib.sha256
+    ).hexdigest()
+    return {
+        const.HEADER_TIMESTAMP: timestamp,
+        const.HEADER_NONCE: nonce,
+        const.HEADER_SIGNATURE: f"sha256={digest}",
+    }
+
+
+def test_gzip_bomb_is_rejected(apti):
+    """작은 gzip 본문이 최대 크기 이상으로 풀리면 413."""
+    const = importlib.import_module("apti.const")
+    bomb = gzip.compress(b"[" + b"0," * (const.MAX_WEBHOOK_PAYLOAD * 8) + b"0]")
+    assert len(bomb) < const.MAX_WEBHOOK_PAYLOAD
+
+    status = asyncio.run(_post(apti, _route(apti), bomb, {"Content-Encoding": "gzip"}))
+    assert status == 413
+
+
+def test_gzip_body_is_accepted(apti):
+    """최대 크기 안의 gzip 본문은 풀린 JSON으로 접수."""
+    route = _route(apti)
+    body = gzip.compress(b'{"dong_ho": "13061001"}')
+
+    status = asyncio.run(_post(apti, route, body, {"Content-Encoding": "gzip"}))
+    assert status == 202
+    route.coordinator.async_enqueue_webhook.assert_called_once_with(
+        {"dong_ho": "13061001"}
+    )
+
+
+def test_unknown_encoding_is_rejected(apti):
+    """aiohttp가 풀지 않는 인코딩은 415."""
+    status = asyncio.run(
+        _post(apti, _route(apti), b"{}", {"Content-Encoding": "compress"})
+    )
+    assert status == 415
+
+
+@pytest.mark.parametrize("encoding", ["gzip", "identity"])
+def test_signed_body_is_accepted(apti, encoding):
+    """파서가 서명한 본문은 압축 여부와 관계없이 실제 서버에서 접수."""
+    apti_parser = pytest.importorskip("apti_parser")
+    raw, body, used = apti_parser.encode_body({"dong_ho": "13061001"}, encoding)
+    headers = {"Content-Type": "application/json", **apti_parser.sign_body("secret", raw)}
+    if used != "identity":
+        headers["Content-Encoding"] = used
+    route = apti.WebhookRoute(coordinator=mock.Mock(), secret="secret")
+
+    assert asyncio.run(_post(apti, route, body, headers)) == 202
+    route.coordinator.async_enqueue_webhook.assert_called_once_with(
+        {"dong_ho": "13061001"}
+    )
+
+
+def test_non_ascii_signature_is_rejected(apti):
+    """ASCII가 아닌 서명 헤더는 500이 아니라 401."""
+    const = importlib.import_module("apti.const")
+    headers = {
+        const.HEADER_TIMESTAMP: str(int(time.time())),
+        const.HEADER_NONCE: "nonce",
+        const.HEADER_SIGNATURE: "sha256=서명",
+    }
+
+    async def run():
+        request = await _request(b"{}", headers)
+        route = apti.WebhookRoute(coordinator=mock.Mock(), secret="secret")
+        return await apti._async_handle_route(route, "test", request)
+
+    assert asyncio.run(run()).status == 401
+
+
+def test_concurrent_replay_is_rejected(apti):
+    """서명된 같은 요청을 동시에 보내면 하나만 접수."""
+    body = b'{"dong_ho": "13061001"}'
+    headers = _signed(body, "nonce")
+
+    async def run():
+        route = apti.WebhookRoute(coordinator=mock.Mock(), secret="secret")
+        payloads = [_stream() for _ in range(2)]
+        tasks = [
+            asyncio.create_task(
+                apti._async_handle_route(
+                    route, "test", await _request(body, headers, payload)
+                )
+            )
+            for payload in payloads
+        ]
+        # 두 요청 모두 헤더 확인을 마치고 본문을 기다리는 중
+        await asyncio.sleep(0)
+        for payload in payloads:
+            payload.feed_data(body)
+            payload.feed_eof()
+        responses = await asyncio.gather(*tasks)
+        return route, sorted(response.status for response in responses)
+
+    route, statuses = asyncio.run(run())
+    assert statuses == [202, 401]
+    assert "nonce" in route.nonces
+
+
+def test_bad_signatures_do_not_evict_nonces(apti):
+    """서명이 틀린 요청은 nonce를 기록하지 않아 사용한 nonce를 밀어내지 못함."""
+    const = importlib.import_module("apti.const")
+    body = b'{"dong_ho": "13061001"}'
+    route = apti.WebhookRoute(coordinator=mock.Mock(), secret="secret")
+
+    async def run():
+        async with _client(apti, route) as client:
+
+            async def post(headers):
+                response = await client.post("/api/webhook/test", data=body, headers=headers)
+                return response.status
+
+            statuses = [await post(_signed(body, "good"))]
+            for index in range(const.NONCE_CACHE_SIZE + 1):
+                forged = {**_signed(body, f"forged{index}"), const.HEADER_SIGNATURE: "sha256=00"}
+                statuses.append(await post(forged))
+            statuses.append(await post(_signed(body, "good")))
+            return statuses
+
+    statuses = asyncio.run(run())
+    assert statuses[0] == 202
+    assert set(statuses[1:]) == {401}
+    assert "good" in route.nonces
+    assert not route.pending_nonces
+
+
+def test_options_secret_applies_without_reload(apti):
+    """옵션에서 바꾼 비밀키가 처음 설정한 값보다 우선하고 바로 반영됨."""
+    const = importlib.import_module("apti.const")
+    entry = mock.Mock(
+        data={const.CONF_WEBHOOK_ID: "test", const.CONF_WEBHOOK_SECRET: ""}, options={}
+    )
+    hass = mock.Mock(data={})
+    route = apti.WebhookRoute(coordinator=mock.Mock(), secret=apti.webhook_secret(entry))
+    apti._routes(hass)["test"] = route
+    assert route.secret is None
+
+    entry.options = {const.CONF_WEBHOOK_SECRET: "rotated"}
+    asyncio.run(apti._async_update_options(hass, entry))
+    assert route.secret == "rotated"
+
+    entry.options = {const.CONF_WEBHOOK_SECRET: ""}
+    entry.data[const.CONF_WEBHOOK_SECRET] = "initial"
+    asyncio.run(apti._async_update_options(hass, entry))
+    assert route.secret is None